@@ -1,7 +1,24 @@
 # _pdf/__init__.py
-from .runtime.framework import PdfTheme, DocSpec, PdfCtx, build_pdf
-from .format.images import asset, content_width, fig, fig_if_exists, fig_if_asset, fig_pdf_page
-from .format.txtfmt import txt_to_flowables
+# Re-exports perezosos (PEP 562): `import _pdf` o `python -m _pdf.build --help` no cargan
+# ReportLab hasta que se usa alguno de estos nombres.
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
+
+_LAZY = {
+    "PdfTheme": ".runtime.framework",
+    "DocSpec": ".runtime.framework",
+    "PdfCtx": ".runtime.framework",
+    "build_pdf": ".runtime.framework",
+    "asset": ".format.images",
+    "content_width": ".format.images",
+    "fig": ".format.images",
+    "fig_if_exists": ".format.images",
+    "fig_if_asset": ".format.images",
+    "fig_pdf_page": ".format.images",
+    "txt_to_flowables": ".format.txtfmt",
+}
 
 __all__ = [
     "PdfTheme",
@@ -18,4 +35,17 @@ __all__ = [
 ]
 
 
+def __getattr__(name: str) -> Any:
+    mod = _LAZY.get(name)
+    if mod is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(mod, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
+
+
 __version__ = "0.3.0"
@@ -20,8 +20,8 @@ import shutil
 from pathlib import Path
 from typing import List, Optional
 
-from .engine.compile import compile_txt
-from .engine.scanlib import scan_input
+from .engine.parallel import effective_jobs, run_jobs
+from .engine.scanlib import list_txts, scan_input
 from .term.flags import add_common_flags, console_from_args, verbosity_from_args, output_mode_from_args, show_summary_from_args
 from .term.printers import print_scan_report, print_build_summary
 
@@ -33,6 +33,8 @@ def main(argv: Optional[List[str]] = None) -> None:
     ap.add_argument("--strict", action="store_true", help="En --check, cuenta WARN como error (exit code).")
     ap.add_argument("--materia", type=str, default=None, help="Ruta de materia para ayudar a resolver assets.")
     ap.add_argument("--search-dir", action="append", default=[], help="Directorio extra para buscar assets (repetible).")
+    ap.add_argument("--jobs", "-j", type=int, default=None, help="Procesos en paralelo (default: cantidad de CPUs; 1 = secuencial).")
+    ap.add_argument("--force", action="store_true", help="Recompila todo aunque el PDF esté al día.")
 
     add_common_flags(ap, include_limits=True)
     args = ap.parse_args(argv)
@@ -73,24 +75,38 @@ def main(argv: Optional[List[str]] = None) -> None:
     materia = Path(args.materia).expanduser().resolve() if args.materia else None
     search_dirs = [Path(p).expanduser().resolve() for p in (args.search_dir or [])]
 
-    txts = sorted(input_dir.glob("*.txt"))
+    txts = list_txts(input_dir)
     built = 0
+    up_to_date = 0
     ok = True
+    workers = effective_jobs(args.jobs, len(txts))
 
-    for txt in txts:
-        try:
-            out_pdf = out_dir / (txt.stem + ".pdf")
-            compile_txt(txt_path=txt, out_dir=out_dir, out_name=out_pdf.name, materia=materia, extra_search_dirs=search_dirs)
-            built += 1
-            if verbosity >= 2 and not args.quiet:
-                c.print(f"  {c.g.dot} {txt.name} {c.g.arrow} {out_pdf.name}")
-        except Exception as e:
+    jobs = [
+        dict(txt_path=txt, out_dir=out_dir, out_name=txt.stem + ".pdf", materia=materia, extra_search_dirs=search_dirs, force=args.force, prefetch=workers <= 1)
+        for txt in txts
+    ]
+
+    # Import diferido: ReportLab solo se carga si efectivamente hay que compilar.
+    from .engine.compile import compile_txt
+
+    for idx, res, err in run_jobs(compile_txt, jobs, max_workers=workers):
+        txt = txts[idx]
+        if err is not None:
             ok = False
             if not args.quiet:
-                c.print(c.red(f"{c.g.err} ERROR en {txt}: {e}"))
+                c.print(c.red(f"{c.g.err} ERROR en {txt}: {err}"))
+            continue
+        out_pdf, skipped = res
+        if skipped:
+            up_to_date += 1
+        else:
+            built += 1
+        if verbosity >= 2 and not args.quiet:
+            note = f" {c.gray('(al día)')}" if skipped else ""
+            c.print(f"  {c.g.dot} {txt.name} {c.g.arrow} {out_pdf.name}{note}")
 
     if not args.quiet:
-        print_build_summary(c, ok=ok, built=built, out_dir=out_dir, mode=mode, show_summary=show_summary)
+        print_build_summary(c, ok=ok, built=built, up_to_date=up_to_date, out_dir=out_dir, mode=mode, show_summary=show_summary)
 
     raise SystemExit(0 if ok else 1)
 
@@ -25,8 +25,8 @@ import sys
 from pathlib import Path
 from typing import List, Optional, Sequence
 
-from .engine.compile import compile_txt
-from .engine.scanlib import scan_materia
+from .engine.parallel import effective_jobs, run_jobs
+from .engine.scanlib import scan_materia, walk_txts
 from .term.flags import (
     add_common_flags,
     console_from_args,
@@ -58,17 +58,11 @@ def _normalize_argv(argv: Optional[List[str]]) -> Optional[List[str]]:
     return argv
 
 
-def _should_skip_dir(path: Path) -> bool:
-    return path.name in SKIP_DIR_NAMES
-
-
 def _discover_txts(root: Path, only_names: Optional[Sequence[str]] = None) -> List[Path]:
     txts: List[Path] = []
     only_set = {name.lower() for name in only_names} if only_names else None
 
-    for path in sorted(root.rglob("*.txt")):
-        if any(_should_skip_dir(parent) for parent in path.parents):
-            continue
+    for path in sorted(walk_txts(root, skip_dir=SKIP_DIR_NAMES.__contains__)):
         if only_set and path.parent.name.lower() not in only_set and path.stem.lower() not in only_set:
             continue
         txts.append(path)
@@ -98,6 +92,8 @@ def main(argv: Optional[List[str]] = None) -> None:
     )
     ap.add_argument("--check", action="store_true", help="Solo valida formato y assets (no genera PDFs).")
     ap.add_argument("--strict", action="store_true", help="En --check, cuenta WARN como error (exit code).")
+    ap.add_argument("--jobs", "-j", type=int, default=None, help="Procesos en paralelo (default: cantidad de CPUs; 1 = secuencial).")
+    ap.add_argument("--force", action="store_true", help="Recompila todo aunque el PDF esté al día.")
 
     add_common_flags(ap, include_limits=True)
     args = ap.parse_args(argv)
@@ -137,29 +133,44 @@ def main(argv: Optional[List[str]] = None) -> None:
         raise SystemExit(0)
 
     built = 0
+    up_to_date = 0
     ok = True
+    workers = effective_jobs(args.jobs, len(txts))
+
+    jobs = [
+        dict(
+            txt_path=txt,
+            out_dir=txt.parent,
+            out_name=f"{txt.stem}.pdf",
+            materia=carpeta,
+            extra_search_dirs=None,
+            force=args.force,
+            prefetch=workers <= 1,
+        )
+        for txt in txts
+    ]
 
-    for txt in txts:
-        try:
-            out_dir = txt.parent
-            out_name = f"{txt.stem}.pdf"
-            out_pdf = compile_txt(
-                txt_path=txt,
-                out_dir=out_dir,
-                out_name=out_name,
-                materia=carpeta,
-                extra_search_dirs=None,
-            )
-            built += 1
-            if verbosity >= 2 and not args.quiet:
-                c.print(f"  {c.g.dot} {txt.name} {c.g.arrow} {out_pdf}")
-        except Exception as e:
+    # Import diferido: ReportLab solo se carga si efectivamente hay que compilar.
+    from .engine.compile import compile_txt
+
+    for idx, res, err in run_jobs(compile_txt, jobs, max_workers=workers):
+        txt = txts[idx]
+        if err is not None:
             ok = False
             if not args.quiet:
-                c.print(c.red(f"{c.g.err} ERROR en {txt}: {e}"))
+                c.print(c.red(f"{c.g.err} ERROR en {txt}: {err}"))
+            continue
+        out_pdf, skipped = res
+        if skipped:
+            up_to_date += 1
+        else:
+            built += 1
+        if verbosity >= 2 and not args.quiet:
+            note = f" {c.gray('(al día)')}" if skipped else ""
+            c.print(f"  {c.g.dot} {txt.name} {c.g.arrow} {out_pdf}{note}")
 
     if not args.quiet:
-        print_build_summary(c, ok=ok, built=built, out_dir=carpeta, mode=mode, show_summary=show_summary)
+        print_build_summary(c, ok=ok, built=built, up_to_date=up_to_date, out_dir=carpeta, mode=mode, show_summary=show_summary)
         if show_summary and mode != "quiet":
             c.print(f"  {c.gray('output')} {c.g.arrow} mismo directorio de cada .txt")
 
@@ -15,13 +15,14 @@ Salida en terminal se centraliza en `_pdf/term/`.
 from __future__ import annotations
 
 import argparse
+import os
 import shutil
 import sys
 from pathlib import Path
 from typing import List, Optional, Sequence
 
-from .engine.compile import compile_txt
 from .engine.materia import discover_jobs
+from .engine.parallel import effective_jobs, run_jobs
 from .engine.scanlib import scan_materia
 from .term.flags import (
     add_common_flags,
@@ -42,6 +43,33 @@ def _normalize_argv(argv: Optional[List[str]]) -> Optional[List[str]]:
     return argv
 
 
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Deja `dst` con el contenido de `src`: hardlink si se puede, copia si no.
+
+    El hardlink evita reescribir el PDF entero cuando origen y destino están en el mismo
+    filesystem (caso típico: Resumenes/ y la carpeta del .txt dentro de la misma materia).
+    Se linkea a un temporal y se publica con `os.replace` para no dejar `dst` a medias.
+    """
+    try:
+        if dst.exists() and os.path.samefile(src, dst):
+            return
+    except OSError:
+        pass
+
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    try:
+        os.link(src, tmp)
+        os.replace(tmp, dst)
+        return
+    except OSError:
+        # otro filesystem, FAT/exFAT, permisos, etc.
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
 def main(argv: Optional[List[str]] = None) -> None:
     argv = _normalize_argv(argv if argv is not None else sys.argv[1:])
 
@@ -60,6 +88,8 @@ def main(argv: Optional[List[str]] = None) -> None:
     ap.add_argument("--only", nargs="*", default=None, help="Filtra por prefijos (ej: 00 01 07).")
     ap.add_argument("--check", action="store_true", help="Solo valida formato y assets (no genera PDFs).")
     ap.add_argument("--strict", action="store_true", help="En --check, cuenta WARN como error (exit code).")
+    ap.add_argument("--jobs", "-j", type=int, default=None, help="Procesos en paralelo (default: cantidad de CPUs; 1 = secuencial).")
+    ap.add_argument("--force", action="store_true", help="Recompila todo aunque el PDF esté al día.")
 
     add_common_flags(ap, include_limits=True)
     args = ap.parse_args(argv)
@@ -96,26 +126,50 @@ def main(argv: Optional[List[str]] = None) -> None:
     jobs = discover_jobs(materia, area=args.area, only_prefixes=only_prefixes)
 
     built = 0
+    up_to_date = 0
     ok = True
+    workers = effective_jobs(args.jobs, len(jobs))
+
+    compile_jobs = [
+        dict(
+            txt_path=job.txt_path,
+            out_dir=job.out_dirs[0],
+            out_name=job.out_name,
+            materia=materia,
+            extra_search_dirs=None,
+            force=args.force,
+            prefetch=workers <= 1,
+        )
+        for job in jobs
+    ]
+
+    # Import diferido: ReportLab solo se carga si efectivamente hay que compilar.
+    from .engine.compile import compile_txt
 
-    for job in jobs:
+    # Compilar en paralelo; las copias extra (baratas) se hacen acá, en el proceso padre.
+    for idx, res, err in run_jobs(compile_txt, compile_jobs, max_workers=workers):
+        job = jobs[idx]
         try:
-            primary_out = compile_txt(
-                txt_path=job.txt_path,
-                out_dir=job.out_dirs[0],
-                out_name=job.out_name,
-                materia=materia,
-                extra_search_dirs=None,
-            )
+            if err is not None:
+                raise err
+            primary_out, skipped = res
 
             for extra_out_dir in job.out_dirs[1:]:
+                mirror = extra_out_dir / job.out_name
+                # PDF al día: el espejo ya apunta a él; solo se repone si falta
+                if skipped and mirror.exists():
+                    continue
                 extra_out_dir.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(primary_out, extra_out_dir / job.out_name)
+                _link_or_copy(primary_out, mirror)
 
-            built += 1
+            if skipped:
+                up_to_date += 1
+            else:
+                built += 1
             if verbosity >= 2 and not args.quiet:
                 rendered = ", ".join(str(out_dir / job.out_name) for out_dir in job.out_dirs)
-                c.print(f"  {c.g.dot} {job.txt_path.name} {c.g.arrow} {rendered}")
+                note = f" {c.gray('(al día)')}" if skipped else ""
+                c.print(f"  {c.g.dot} {job.txt_path.name} {c.g.arrow} {rendered}{note}")
         except Exception as e:
             ok = False
             if not args.quiet:
@@ -123,7 +177,7 @@ def main(argv: Optional[List[str]] = None) -> None:
 
     if not args.quiet:
         out_root = materia / "Resumenes"
-        print_build_summary(c, ok=ok, built=built, out_dir=out_root, mode=mode, show_summary=show_summary)
+        print_build_summary(c, ok=ok, built=built, up_to_date=up_to_date, out_dir=out_root, mode=mode, show_summary=show_summary)
         if show_summary and mode != "quiet":
             c.print(f"  {c.gray('mirror')} {c.g.arrow} carpetas origen de cada .txt")
 
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 def candidate_asset_roots(*, txt_dir: Path, materia: Optional[Path] = None, extra: Optional[Iterable[Path]] = None) -> List[Path]:
     roots: List[Path] = [txt_dir]
@@ -19,27 +20,58 @@ def candidate_asset_roots(*, txt_dir: Path, materia: Optional[Path] = None, extr
             roots.append(Path(p).expanduser().resolve())
 
     if materia:
-        roots.extend([
-            materia / "Teorico",
-            materia / "Practico",
-            materia / "Taller",
-            materia,
-        ])
+        roots.extend(_area_roots(materia))
 
     # dedup
     seen = set()
     uniq: List[Path] = []
     for r in roots:
-        try:
-            key = str(r.resolve())
-        except Exception:
-            key = str(r)
+        key = _resolved_key(r)
         if key in seen:
             continue
         seen.add(key)
         uniq.append(r)
     return uniq
 
+@lru_cache(maxsize=4)
+def _area_roots(materia: Path) -> Tuple[Path, ...]:
+    return (materia / "Teorico", materia / "Practico", materia / "Taller", materia)
+
+
+@lru_cache(maxsize=256)
+def _resolved_key(r: Path) -> str:
+    try:
+        return str(r.resolve())
+    except Exception:
+        return str(r)
+
+
+def _root_stamp(r: Path) -> int:
+    try:
+        return os.stat(r).st_mtime_ns
+    except OSError:
+        return -1
+
+
+@lru_cache(maxsize=32)
+def _roots_index(roots: Tuple[Path, ...], stamps: Tuple[int, ...]) -> Dict[str, Path]:
+    """nombre de entrada -> primer root (en orden de prioridad) que la contiene.
+
+    Un `scandir` por root en vez de un stat por (asset, root). `stamps` (mtime de cada
+    root) es parte de la clave: crear o borrar una entrada cambia el mtime del directorio
+    y fuerza a reindexar.
+    """
+    index: Dict[str, Path] = {}
+    for r in roots:
+        try:
+            with os.scandir(r) as it:
+                for e in it:
+                    index.setdefault(os.path.normcase(e.name), r)
+        except OSError:
+            continue
+    return index
+
+
 def find_asset(name: str, roots: List[Path]) -> Optional[Path]:
     name = (name or "").strip()
     if not name:
@@ -49,6 +81,14 @@ def find_asset(name: str, roots: List[Path]) -> Optional[Path]:
     if p.is_absolute():
         return p if p.exists() else None
 
+    if len(p.parts) == 1:
+        key = tuple(roots)
+        hit = _roots_index(key, tuple(_root_stamp(r) for r in key)).get(os.path.normcase(name))
+        # Con mtime de granularidad gruesa el índice puede estar viejo: se confirma el hit.
+        if hit is not None and (hit / name).is_file():
+            return hit / name
+
+    # subrutas (ej: "img/x.png") o archivos que no estaban al indexar
     for r in roots:
         cand = r / name
         if cand.exists():
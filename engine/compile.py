@@ -1,62 +1,178 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from .assets import candidate_asset_roots, find_asset
-from .docheader import parse_doc_header
-from .paths import find_materia_root
-from ..runtime.core import DocSpec, PdfTheme
+from .docheader import Scalar, load_doc
+from .paths import find_materia_root, page_cache_dir
+from ..runtime.core import DEFAULT_THEME, DocSpec, PdfTheme
 from ..runtime.framework import build_pdf
 from ..format.txtfmt import txt_to_flowables
+from ..format.images import close_open_pdfs, fig_page_png_path, prerender_pages, prewarm_images
+from ..format.txtfmt_syntax import parse_fig_marker, parse_img_marker
 
 
-def _read_text(p: Path) -> str:
+def _infer_materia(txt_path: Path) -> Optional[Path]:
+    # intento liviano de inferencia; si falla, None
     try:
-        return p.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        return p.read_text(encoding="latin-1")
+        return find_materia_root(txt_path.parent)
+    except Exception:
+        return None
 
 
 def _resolver_for(*, txt_path: Path, materia: Optional[Path], extra_search_dirs: Optional[Iterable[Path]] = None) -> Tuple[Callable[[str], Path], Callable[[str], Path], List[Path]]:
     if materia is None:
-        # intento liviano de inferencia; si falla, None
-        try:
-            materia = find_materia_root(txt_path.parent)
-        except Exception:
-            materia = None
+        materia = _infer_materia(txt_path)
 
     roots = candidate_asset_roots(txt_dir=txt_path.parent, materia=materia, extra=extra_search_dirs)
 
-    def resolve_pdf(name: str) -> Path:
+    # [FIG] y [IMG] comparten la misma búsqueda; se exponen por separado por compat.
+    def resolve(name: str) -> Path:
         p = find_asset(name, roots)
         if p is None:
             # devolver path "best effort" para que el error sea visible en el build
             return (roots[0] / name) if roots else Path(name)
         return p
 
-    def resolve_img(name: str) -> Path:
-        p = find_asset(name, roots)
-        if p is None:
-            return (roots[0] / name) if roots else Path(name)
-        return p
+    return resolve, resolve, roots
+
+
+def _asset_deps(rest: str, resolve_pdf: Callable[[str], Path], resolve_img: Callable[[str], Path]) -> List[Path]:
+    """Archivos referenciados por `[FIG ...]` / `[IMG ...]` (dependencias del PDF)."""
+    deps: List[Path] = []
+    for raw in rest.splitlines():
+        s = raw.strip()
+        if s.startswith("[FIG"):
+            fig = parse_fig_marker(s)
+            if fig is not None:
+                deps.append(resolve_pdf(fig[0]))
+        elif s.startswith("[IMG"):
+            img = parse_img_marker(s)
+            if img is not None:
+                deps.append(resolve_img(img[0]))
+    return deps
+
+
+def _fig_pages(rest: str, resolve_pdf: Callable[[str], Path]) -> List[Tuple[Path, int, float]]:
+    """`(pdf, página, zoom)` de cada `[FIG ...]` válido del documento."""
+    out: List[Tuple[Path, int, float]] = []
+    for raw in rest.splitlines():
+        s = raw.strip()
+        if s.startswith("[FIG"):
+            fig = parse_fig_marker(s)
+            if fig is not None:
+                fn, page, _cap, zoom = fig
+                out.append((resolve_pdf(fn), page, zoom))
+    return out
+
+
+def _is_up_to_date(out_path: Path, deps: Sequence[Path]) -> bool:
+    """True si `out_path` existe y es más nuevo que todas sus dependencias.
+
+    Una dependencia inexistente cuenta como desactualizada: se recompila para que el
+    aviso/error del asset faltante vuelva a aparecer.
+    """
+    try:
+        out_mtime = out_path.stat().st_mtime_ns
+    except OSError:
+        return False
+    for d in deps:
+        try:
+            if d.stat().st_mtime_ns > out_mtime:
+                return False
+        except OSError:
+            return False
+    return True
 
-    return resolve_pdf, resolve_img, roots
 
+_PREFETCH_POOL: Optional[ThreadPoolExecutor] = None
+_PREFETCH_CHUNK = 1 << 20
 
-def _spec_from_attrs(*, out_path: Path, attrs: dict) -> DocSpec:
-    # DocSpec tiene defaults; solo seteamos lo que venga
-    kwargs = dict(attrs)
-    kwargs.pop("out", None)
 
-    # Asegurar tipos esperados
-    if "toc_max_level" in kwargs:
-        try:
-            kwargs["toc_max_level"] = int(kwargs["toc_max_level"])
-        except Exception:
-            kwargs.pop("toc_max_level", None)
+def _warm_file(p: Path) -> None:
+    # Solo llenar el page cache del SO; el contenido se descarta.
+    try:
+        with open(p, "rb", buffering=0) as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                return
+            buf = bytearray(_PREFETCH_CHUNK)
+            while f.readinto(buf):
+                pass
+    except OSError:
+        pass
+
 
+def _prefetch(paths: Iterable[Path]) -> None:
+    """Lee en segundo plano los assets de `[FIG]`/`[IMG]` mientras se arma el documento."""
+    global _PREFETCH_POOL
+    if _PREFETCH_POOL is None:
+        _PREFETCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pdf-prefetch")
+    for p in dict.fromkeys(paths):
+        _PREFETCH_POOL.submit(_warm_file, p)
+
+
+def _as_str(v: Scalar) -> Optional[str]:
+    if isinstance(v, bool):
+        return "true" if v else "false"
+    return str(v)
+
+
+def _as_bool(v: Scalar) -> Optional[bool]:
+    return v if isinstance(v, bool) else None
+
+
+def _as_int(v: Scalar) -> Optional[int]:
+    if isinstance(v, bool):
+        return None
+    if isinstance(v, int):
+        return v
+    try:
+        return int(v)
+    except ValueError:
+        return None
+
+
+# Campos de DocSpec seteables desde el header [DOC ...] -> coerción al tipo del campo.
+# Claves desconocidas se ignoran (scan las reporta como WARN).
+_SPEC_FIELDS: Tuple[Tuple[str, Callable[[Scalar], object]], ...] = (
+    ("title", _as_str),
+    ("subtitle", _as_str),
+    ("meta_line", _as_str),
+    ("include_title_block", _as_bool),
+    ("include_toc", _as_bool),
+    ("toc_title", _as_str),
+    ("toc_max_level", _as_int),
+    ("footer_left", _as_str),
+    ("footer_center", _as_str),
+    ("footer_right", _as_str),
+    ("footer_show_page", _as_bool),
+    ("footer_link_to_toc", _as_bool),
+    ("author", _as_str),
+    ("subject", _as_str),
+    ("keywords", _as_str),
+    ("system", _as_str),
+    ("contacto", _as_str),
+)
+
+
+_SPEC_COERCE: Dict[str, Callable[[Scalar], object]] = dict(_SPEC_FIELDS)
+
+
+def _spec_from_attrs(*, out_path: Path, attrs: Dict[str, Scalar], default_title: str) -> DocSpec:
+    # DocSpec tiene defaults; solo seteamos lo que venga (y tenga el tipo correcto).
+    # Se recorre el header (pocas claves) y no la tabla completa de campos.
+    kwargs: Dict[str, object] = {"title": default_title}
+    for name, raw in attrs.items():
+        coerce = _SPEC_COERCE.get(name)
+        if coerce is None:
+            continue
+        v = coerce(raw)
+        if v is not None:
+            kwargs[name] = v
     return DocSpec(out_path=out_path, **kwargs)  # type: ignore[arg-type]
 
 
@@ -68,14 +184,24 @@ def compile_txt(
     materia: Optional[Path] = None,
     theme: Optional[PdfTheme] = None,
     extra_search_dirs: Optional[Iterable[Path]] = None,
-) -> Path:
-    """Compila un .txt al PDF. Retorna la ruta del PDF generado."""
+    force: bool = True,
+    prefetch: bool = False,
+) -> Tuple[Path, bool]:
+    """Compila un .txt al PDF. Retorna `(ruta del PDF, salteado)`.
+
+    Con `force=False` no recompila si el PDF ya es más nuevo que el `.txt` y que los
+    assets de sus `[FIG]`/`[IMG]` (build incremental, estilo make); en ese caso `salteado`
+    es True y el PDF existente queda intacto.
+    Con `prefetch=True` esos assets se leen en threads mientras ReportLab arma estilos y
+    flowables, y las páginas de `[FIG]` se exportan en paralelo (procesos) antes del render.
+    Pensado para builds secuenciales: con `--jobs > 1` los cores ya están ocupados por documento.
+    """
     txt_path = txt_path.expanduser().resolve()
     out_dir = out_dir.expanduser().resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    text = _read_text(txt_path)
-    attrs, _, rest, header_err = parse_doc_header(text)
+    doc = load_doc(txt_path)
+    attrs, rest, header_err = doc.attrs, doc.rest, doc.error
     if header_err:
         raise RuntimeError(f"{txt_path}: {header_err}")
 
@@ -83,16 +209,39 @@ def compile_txt(
     final_name = out_name or (str(out_from_header) if isinstance(out_from_header, str) and out_from_header else (txt_path.stem + ".pdf"))
     out_path = out_dir / final_name
 
+    if materia is None:
+        materia = _infer_materia(txt_path)
+    cache_dir = page_cache_dir(materia)
+
     resolve_pdf, resolve_img, _roots = _resolver_for(txt_path=txt_path, materia=materia, extra_search_dirs=extra_search_dirs)
 
-    def build_content(ctx):
-        return txt_to_flowables(
-            ctx,
-            rest,
-            resolve_pdf=resolve_pdf,
-            resolve_img=resolve_img,
-            cache_dir=None,
-        )
-
-    spec = _spec_from_attrs(out_path=out_path, attrs=attrs)
-    return build_pdf(spec, build_content, theme=theme)
+    deps = _asset_deps(rest, resolve_pdf, resolve_img) if (prefetch or not force) else []
+    if not force and _is_up_to_date(out_path, [txt_path, *deps]):
+        return out_path, True
+    try:
+        if prefetch and deps:
+            _prefetch(deps)
+            # [FIG] siempre apunta a un PDF; el resto son imágenes de [IMG]
+            prewarm_images([d for d in deps if d.suffix.lower() != ".pdf"])
+            pages = _fig_pages(rest, resolve_pdf)
+            if len(pages) > 1:
+                th = theme if theme is not None else DEFAULT_THEME
+                items = []
+                for pdf, page, zoom in pages:
+                    png, z = fig_page_png_path(th, pdf, page, zoom=zoom, cache_dir=cache_dir)
+                    items.append((pdf, page, png, z))
+                prerender_pages(items)
+
+        def build_content(ctx):
+            return txt_to_flowables(
+                ctx,
+                rest,
+                resolve_pdf=resolve_pdf,
+                resolve_img=resolve_img,
+                cache_dir=cache_dir,
+            )
+
+        spec = _spec_from_attrs(out_path=out_path, attrs=attrs, default_title=txt_path.stem)
+        return build_pdf(spec, build_content, theme=theme), False
+    finally:
+        close_open_pdfs()  # no dejar los PDFs fuente abiertos (bloqueados en Windows) entre documentos
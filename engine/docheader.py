@@ -1,15 +1,14 @@
 from __future__ import annotations
 
-import shlex
-import re
-from typing import Dict, List, Optional, Tuple, Union
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
 Scalar = Union[str, bool, int]
 
-_DOC_RE = re.compile(r"^\[DOC(?P<body>.*)\]\s*$")
 
 # Mantener en sync con runtime.core.DocSpec
-ALLOWED_DOC_KEYS = {
+ALLOWED_DOC_KEYS = frozenset({
     "out",
     "title",
     "subtitle",
@@ -28,20 +27,72 @@ ALLOWED_DOC_KEYS = {
     "keywords",
     "system",
     "contacto",
-}
+})
+
+_SPACE = " \t\r\n"
 
 def _parse_scalar(v: str) -> Scalar:
     s = v.strip()
     lo = s.lower()
-    if lo in {"true", "false"}:
+    if lo == "true" or lo == "false":
         return lo == "true"
-    if re.fullmatch(r"-?\d+", s):
-        try:
-            return int(s)
-        except Exception:
-            return s
+    # Equivale a fullmatch(r"-?\d+"): isdecimal() acepta lo mismo que \d, así int() no falla.
+    digits = s[1:] if s.startswith("-") else s
+    if digits.isdecimal():
+        return int(s)
     return s
 
+def _split_tokens(body: str) -> List[str]:
+    """Separa `clave=valor` en una sola pasada, con las reglas de `shlex.split` (POSIX).
+
+    - Comillas dobles o simples agrupan espacios y se quitan del token.
+    - Dentro de comillas dobles, `\\` solo escapa `"` y `\\`; fuera de comillas escapa cualquier char.
+    - Comillas sin cerrar -> ValueError (mismo mensaje que shlex).
+    """
+    toks: List[str] = []
+    buf: List[str] = []
+    in_tok = False
+    quote = ""
+    i, n = 0, len(body)
+    while i < n:
+        ch = body[i]
+        if quote:
+            if ch == quote:
+                quote = ""
+            elif ch == "\\" and quote == '"':
+                if i + 1 >= n:
+                    raise ValueError("No escaped character")
+                if body[i + 1] in '"\\':
+                    i += 1
+                buf.append(body[i])
+            else:
+                buf.append(ch)
+        elif ch in _SPACE:
+            if in_tok:
+                toks.append("".join(buf))
+                buf.clear()
+                in_tok = False
+        elif ch == '"' or ch == "'":
+            quote = ch
+            in_tok = True
+        elif ch == "\\":
+            if i + 1 >= n:
+                raise ValueError("No escaped character")
+            i += 1
+            buf.append(body[i])
+            in_tok = True
+        else:
+            buf.append(ch)
+            in_tok = True
+        i += 1
+
+    if quote:
+        raise ValueError("No closing quotation")
+    if in_tok:
+        toks.append("".join(buf))
+    return toks
+
+
 def parse_doc_header(text: str) -> Tuple[Dict[str, Scalar], List[str], str, Optional[str]]:
     """Parsea un header [DOC ...] si está en la primera línea no vacía.
 
@@ -51,26 +102,38 @@ def parse_doc_header(text: str) -> Tuple[Dict[str, Scalar], List[str], str, Opti
       rest_text: el texto sin la línea del header
       error: mensaje de error si el header existe pero es inválido
     """
-    lines = text.splitlines()
-    i = 0
-    while i < len(lines) and not lines[i].strip():
-        i += 1
-    if i >= len(lines):
+    # Sin splitlines/join: se ubica la primera línea no vacía por índices y el resto
+    # del texto se arma con slices del original (conserva los fines de línea).
+    n = len(text)
+    i = n - len(text.lstrip())
+    if i >= n:
         return {}, [], text, None
 
-    m = _DOC_RE.match(lines[i].strip())
-    if not m:
+    line_start = max(text.rfind("\n", 0, i), text.rfind("\r", 0, i)) + 1
+    eol = text.find("\n", i)
+    if eol == -1:
+        eol = n
+    cr = text.find("\r", i, eol)
+    if cr == -1:
+        line_end, next_line = eol, eol + 1
+    else:
+        # CRLF o CR suelto (archivos viejos de Mac)
+        line_end, next_line = cr, (cr + 2 if text.startswith("\n", cr + 1) else cr + 1)
+    rest = text[:line_start] + text[next_line:]
+
+    # Equivale a r"^\[DOC(.*)\]\s*$" sobre la línea ya stripeada, sin pasar por `re`.
+    head = text[i:line_end].rstrip()
+    if not (head.startswith("[DOC") and head.endswith("]")):
         return {}, [], text, None
 
-    body = (m.group("body") or "").strip()
+    body = head[4:-1].strip()
     attrs: Dict[str, Scalar] = {}
     unknown: List[str] = []
 
     if body:
         try:
-            toks = shlex.split(body)
+            toks = _split_tokens(body)
         except ValueError as e:
-            rest = "\n".join(lines[:i] + lines[i+1:])
             return {}, [], rest, f"Header [DOC ...] inválido: {e}"
 
         for tok in toks:
@@ -82,5 +145,39 @@ def parse_doc_header(text: str) -> Tuple[Dict[str, Scalar], List[str], str, Opti
             if k not in ALLOWED_DOC_KEYS:
                 unknown.append(k)
 
-    rest = "\n".join(lines[:i] + lines[i+1:])
     return attrs, unknown, rest, None
+
+
+class DocFile(NamedTuple):
+    text: str
+    attrs: Dict[str, Scalar]
+    unknown_keys: List[str]
+    rest: str
+    error: Optional[str]
+
+
+def _read_text(p: Path) -> str:
+    # Una sola lectura (sin TextIOWrapper); el fallback a latin-1 reusa los mismos bytes.
+    data = p.read_bytes()
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+@lru_cache(maxsize=256)
+def _load_doc(path: str, mtime_ns: int, size: int) -> DocFile:
+    text = _read_text(Path(path))
+    attrs, unknown, rest, err = parse_doc_header(text)
+    return DocFile(text, attrs, unknown, rest, err)
+
+
+def load_doc(path: Path) -> DocFile:
+    """Lee un .txt y parsea su header [DOC ...].
+
+    El resultado se cachea por (ruta, mtime, tamaño): discovery, scan y build leen
+    el mismo archivo varias veces por corrida y solo la primera toca disco.
+    Los dicts/listas devueltos se comparten entre llamadas; no mutarlos.
+    """
+    st = path.stat()
+    return _load_doc(str(path), st.st_mtime_ns, st.st_size)
@@ -5,7 +5,7 @@ from pathlib import Path
 from typing import Iterable, List, Optional, Sequence, Tuple
 
 from .scanlib import discover_txts
-from .docheader import parse_doc_header
+from .docheader import load_doc
 
 
 @dataclass(frozen=True)
@@ -70,9 +70,7 @@ def discover_jobs(
             if not any(part.startswith(pref) for pref in only_prefixes for part in f.parts):
                 continue
 
-        text = f.read_text(encoding="utf-8", errors="ignore")
-        attrs, _, _, _ = parse_doc_header(text)
-        out = attrs.get("out")
+        out = load_doc(f).attrs.get("out")
         out_name = str(out) if isinstance(out, str) and out else _default_out_name(f)
 
         resumenes_dir = dest_root / a if a in {"Practico", "Taller", "Teorico"} else dest_root
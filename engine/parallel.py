@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+def default_jobs() -> int:
+    return os.cpu_count() or 1
+
+
+def effective_jobs(requested: Optional[int], n_jobs: int) -> int:
+    """Workers que va a usar `run_jobs`: lo pedido (o `default_jobs()`), nunca más que jobs.
+
+    Con 1 (p.ej. un solo documento) se corre en el proceso actual: ahí conviene el prefetch.
+    """
+    return min(requested or default_jobs(), n_jobs)
+
+
+def run_jobs(
+    fn: Callable[..., Any],
+    jobs: Sequence[Dict[str, Any]],
+    *,
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[int, Any, Optional[Exception]]]:
+    """Ejecuta `fn(**kwargs)` por cada job y devuelve `(idx, resultado, error)`.
+
+    - Los resultados salen en el mismo orden que `jobs` (salida de terminal estable).
+    - Con `max_workers <= 1` (o un solo job) corre en el proceso actual, sin pool:
+      útil para debug y equivalente al comportamiento secuencial histórico.
+    - `fn` y los kwargs tienen que ser picklables (funciones de módulo, Path, str, bool).
+    """
+    workers = default_jobs() if max_workers is None else max_workers
+    workers = min(workers, len(jobs))
+
+    if workers <= 1:
+        for idx, kwargs in enumerate(jobs):
+            try:
+                yield idx, fn(**kwargs), None
+            except Exception as e:
+                yield idx, None, e
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futs: List[Future] = [ex.submit(fn, **kwargs) for kwargs in jobs]
+        for idx, fut in enumerate(futs):
+            try:
+                yield idx, fut.result(), None
+            except Exception as e:
+                yield idx, None, e
@@ -2,9 +2,12 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
-_MATERIA_MARKERS = ("Practico", "Teorico", "Taller")
+_MATERIA_MARKERS = frozenset({"Practico", "Teorico", "Taller"})
+# Comparación contra entradas de scandir: en Windows el FS no distingue mayúsculas.
+_MARKER_NAMES = frozenset(os.path.normcase(n) for n in _MATERIA_MARKERS)
 
 
 def pdf_pkg_dir() -> Path:
@@ -19,9 +22,14 @@ def scripts_dir() -> Path:
 
 
 def _looks_like_materia_root(p: Path) -> bool:
-    if not p or not p.is_dir():
+    # Un listado del directorio en vez de un stat por marcador.
+    if not p:
+        return False
+    try:
+        with os.scandir(p) as it:
+            return any(os.path.normcase(e.name) in _MARKER_NAMES and e.is_dir() for e in it)
+    except OSError:
         return False
-    return any((p / name).is_dir() for name in _MATERIA_MARKERS)
 
 
 def find_materia_root(start: Path | None = None) -> Path:
@@ -41,14 +49,21 @@ def find_materia_root(start: Path | None = None) -> Path:
       4) layout legacy: <Materia>/Scripts/_pdf  (usa la ubicación del paquete)
 
     Si no la puede inferir, levanta FileNotFoundError.
+
+    El resultado se memoiza por proceso (clave: env + `start`); los builders lo consultan
+    una vez por `.txt` y casi todos comparten carpeta.
     """
-    env = os.environ.get("PDF_MATERIA_ROOT")
+    return _find_materia_root(os.environ.get("PDF_MATERIA_ROOT") or "", start or Path.cwd())
+
+
+@lru_cache(maxsize=64)
+def _find_materia_root(env: str, start: Path) -> Path:
     if env:
         p = Path(env).expanduser().resolve()
         if _looks_like_materia_root(p):
             return p
 
-    base = (start or Path.cwd()).resolve()
+    base = start.resolve()
     if base.is_file():
         base = base.parent
 
@@ -85,6 +100,17 @@ def taller_dir(materia: Path | None = None) -> Path:
     return m / "Taller"
 
 
+def page_cache_dir(materia: Path | None = None) -> Path:
+    # Cache compartido de páginas exportadas ([FIG ...]) para todos los documentos.
+    # Preferimos <Materia>/Scripts/_pdf/.pagecache; si la materia no tiene ese layout,
+    # cae en la raíz del paquete `_pdf` (mismo lugar en el setup legacy).
+    if materia is not None:
+        cand = materia / "Scripts" / "_pdf"
+        if cand.is_dir():
+            return cand / ".pagecache"
+    return Path(__file__).resolve().parents[1] / ".pagecache"
+
+
 def output_root(materia: Path | None = None) -> Path:
     m = (materia or materia_root()).resolve()
     return m / "Resumenes"
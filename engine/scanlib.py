@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
 from .assets import candidate_asset_roots, find_asset
-from .docheader import parse_doc_header
-from ..format import txtfmt
+from .docheader import load_doc
+from ..format.txtfmt_syntax import (
+    BLOCK_CLOSE_RE,
+    BLOCK_OPEN_RE,
+    CALLOUT_CLOSE_RE,
+    CALLOUT_OPEN_RE,
+    FENCE_CLOSE_RE,
+    FENCE_OPEN_RE,
+    PB_RE,
+    parse_fig_marker,
+    parse_img_marker,
+)
 
 
 @dataclass
@@ -122,19 +133,11 @@ def format_report(report: ScanReport, *, max_issues: int = 40, show_skipped: boo
     return "\n".join(lines)
 
 
-def _read_text(p: Path) -> str:
-    try:
-        return p.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        return p.read_text(encoding="latin-1")
-
-
 def lint_txt(*, txt_path: Path, materia: Optional[Path] = None, extra_search_dirs: Optional[Iterable[Path]] = None) -> List[Issue]:
     """Lint rápido del formato. No genera PDF."""
     issues: List[Issue] = []
-    text = _read_text(txt_path)
-
-    attrs, unknown_keys, rest, header_err = parse_doc_header(text)
+    doc = load_doc(txt_path)
+    unknown_keys, rest, header_err = doc.unknown_keys, doc.rest, doc.error
     if header_err:
         issues.append(Issue("ERROR", txt_path, 1, header_err))
     elif unknown_keys:
@@ -142,17 +145,6 @@ def lint_txt(*, txt_path: Path, materia: Optional[Path] = None, extra_search_dir
 
     roots = candidate_asset_roots(txt_dir=txt_path.parent, materia=materia, extra=extra_search_dirs)
 
-    # Regex del parser (misma semántica que el build)
-    FIG_RE = getattr(txtfmt, "_FIG_RE")
-    IMG_RE = getattr(txtfmt, "_IMG_RE")
-    PB_RE = getattr(txtfmt, "_PB_RE")
-    CALLOUT_OPEN_RE = getattr(txtfmt, "_CALLOUT_OPEN_RE")
-    CALLOUT_CLOSE_RE = getattr(txtfmt, "_CALLOUT_CLOSE_RE")
-    BLOCK_OPEN_RE = getattr(txtfmt, "_BLOCK_OPEN_RE")
-    BLOCK_CLOSE_RE = getattr(txtfmt, "_BLOCK_CLOSE_RE")
-    FENCE_OPEN_RE = getattr(txtfmt, "_FENCE_OPEN_RE")
-    FENCE_CLOSE_RE = getattr(txtfmt, "_FENCE_CLOSE_RE")
-
     in_fence = False
     fence_open_line: Optional[int] = None
     block_stack: List[Tuple[str, int]] = []
@@ -212,13 +204,11 @@ def lint_txt(*, txt_path: Path, materia: Optional[Path] = None, extra_search_dir
             continue
 
         if s.startswith("[FIG"):
-            m = FIG_RE.match(s)
-            if not m:
+            fig = parse_fig_marker(s)
+            if fig is None:
                 issues.append(Issue("ERROR", txt_path, i, "Marcador [FIG] inválido."))
             else:
-                fn = m.group("file")
-                page = int(m.group("page"))
-                zoom = float(m.group("zoom") or "2.0")
+                fn, page, _cap, zoom = fig
                 if page < 1:
                     issues.append(Issue("ERROR", txt_path, i, f"[FIG] page debe ser >= 1 (1-based). Vino: {page}"))
                 if zoom <= 0:
@@ -228,11 +218,11 @@ def lint_txt(*, txt_path: Path, materia: Optional[Path] = None, extra_search_dir
             continue
 
         if s.startswith("[IMG"):
-            m = IMG_RE.match(s)
-            if not m:
+            img = parse_img_marker(s)
+            if img is None:
                 issues.append(Issue("ERROR", txt_path, i, "Marcador [IMG] inválido."))
             else:
-                fn = m.group("file")
+                fn = img[0]
                 if find_asset(fn, roots) is None:
                     issues.append(Issue("WARN", txt_path, i, f"[IMG] no encontré '{fn}' en: " + ", ".join(str(r) for r in roots)))
             continue
@@ -276,24 +266,16 @@ def discover_txts(base: Path, *, exclude_dirs: Optional[Iterable[str]] = None) -
         "_pdf",
     }
 
-    out: List[Path] = []
-    for p in base.rglob("*.txt"):
-        if any(part.lower() in exclude for part in p.parts):
-            continue
-        if p.name.startswith("."):
-            continue
-        out.append(p)
-    return sorted(out)
+    return sorted(p for p in walk_txts(base, skip_dir=lambda name: name.lower() in exclude) if not p.name.startswith("."))
 
 def _is_candidate_txt(p: Path) -> bool:
     try:
-        text = _read_text(p)
+        doc = load_doc(p)
     except Exception:
         return False
-    attrs, _, _, _ = parse_doc_header(text)
-    if attrs:
+    if doc.attrs:
         return True
-    head = text[:5000]
+    head = doc.text[:5000]
     for tok in ("[FIG", "[IMG", ":::", "[NOTE]", "[WARN]", "[TIP]", "[PB]"):
         if tok in head:
             return True
@@ -312,9 +294,35 @@ def scan_files(files: List[Path], *, materia: Optional[Path] = None, extra_searc
         results.append(ScanFileResult(f, issues))
 
     return ScanReport(results, txt_total=total, txt_candidates=len(candidates), skipped_files=sorted(skipped))
+
+
+def list_txts(d: Path) -> List[Path]:
+    """`.txt` directos de `d` (sin recursión), ordenados.
+
+    Usa `os.scandir`: el tipo de cada entrada sale del dirent, sin un stat extra por archivo.
+    """
+    try:
+        with os.scandir(d) as it:
+            return sorted(Path(e.path) for e in it if e.name.endswith(".txt") and e.is_file())
+    except FileNotFoundError:
+        return []
+
+
+def walk_txts(base: Path, *, skip_dir: Callable[[str], bool]) -> Iterator[Path]:
+    """`.txt` bajo `base` (recursivo), podando carpetas para las que `skip_dir(nombre)` es True.
+
+    A diferencia de `rglob` + filtro por `parts`, las carpetas excluidas no se recorren.
+    """
+    for dirpath, dirnames, filenames in os.walk(base):
+        dirnames[:] = [d for d in dirnames if not skip_dir(d)]
+        for name in filenames:
+            if name.endswith(".txt"):
+                yield Path(dirpath, name)
+
+
 def scan_input(pkg_root: Path, *, extra_search_dirs: Optional[Iterable[Path]] = None) -> ScanReport:
     input_dir = pkg_root / "input"
-    files = sorted(input_dir.glob("*.txt"))
+    files = list_txts(input_dir)
     return scan_files(files, materia=None, extra_search_dirs=extra_search_dirs)
 
 
@@ -3,13 +3,18 @@
 
 from __future__ import annotations
 
+import atexit
+import hashlib
 import os
 import sys
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict, Sequence, Tuple
 
 from reportlab.platypus import Image as RLImage, Spacer, Table, TableStyle
-from reportlab.lib import colors
+
+from ..runtime.utils import hex_color
 
 Flowable = Any
 
@@ -25,23 +30,31 @@ def _warn(msg: str) -> None:
         print(f"[WARN][_pdf] {msg}", file=sys.stderr)
 
 
-def asset(base_dir: Path, name: str, fallback_dir: Optional[Path] = None) -> Path:
-    p1 = base_dir / name
-    if p1.is_file():
-        return p1
+# `assets/` junto a este módulo (fallback si no se pasa uno ni hay PDF_ASSET_FALLBACK)
+_DEFAULT_ASSET_FALLBACK = os.path.join(os.path.dirname(os.path.realpath(__file__)), "assets")
 
-    if fallback_dir is None:
-        env = os.getenv("PDF_ASSET_FALLBACK", "").strip()
-        if env:
-            fallback_dir = Path(env)
-        else:
-            fallback_dir = Path(__file__).resolve().parent / "assets"  # Scripts/_pdf/assets
+# (base_dir, name, fallback_dir) -> ruta encontrada. Solo se cachean aciertos: un asset
+# que falta puede aparecer más tarde (p. ej. un gráfico generado por el mismo script).
+_ASSET_HITS: Dict[Tuple[str, str, str], str] = {}
 
-    p2 = fallback_dir / name
-    if p2.is_file():
-        return p2
 
-    _warn(f"Asset no encontrado: '{name}' (buscado en '{p1}' y fallback '{p2}')")
+def asset(base_dir: Path, name: str, fallback_dir: Optional[Path] = None) -> Path:
+    fb = str(fallback_dir) if fallback_dir is not None else (
+        os.getenv("PDF_ASSET_FALLBACK", "").strip() or _DEFAULT_ASSET_FALLBACK
+    )
+    key = (str(base_dir), name, fb)
+    hit = _ASSET_HITS.get(key)
+    if hit is None:
+        for d in (key[0], fb):
+            cand = os.path.join(d, name)
+            if os.path.isfile(cand):
+                hit = _ASSET_HITS[key] = cand
+                break
+    if hit is not None:
+        return Path(hit)
+
+    p1 = base_dir / name
+    _warn(f"Asset no encontrado: '{name}' (buscado en '{p1}' y fallback '{Path(fb) / name}')")
     return p1
 
 
@@ -52,22 +65,75 @@ def content_width(ctx) -> float:
     return float(page_w - ctx.theme.left_margin - ctx.theme.right_margin)
 
 
+@lru_cache(maxsize=8)
+def _frame_limits(theme) -> Tuple[float, float]:
+    """(ancho efectivo, altura efectiva mínima) del Frame; depende solo del theme.
+
+    La altura considera First vs Later (reserved top distintos) y el padding interno del Frame.
+    """
+    page_w, page_h = theme.pagesize
+    w = float(page_w - theme.left_margin - theme.right_margin)
+    h_first = page_h - theme.bottom_margin - theme.first_page_reserved_top
+    h_later = page_h - theme.bottom_margin - theme.later_page_reserved_top
+    h = float(min(h_first, h_later))
+    return max(10.0, w - 2 * _FRAME_PAD), max(10.0, h - 2 * _FRAME_PAD)
+
+
 def _frame_effective_width(ctx) -> float:
     """Ancho efectivo dentro del Frame (resta padding interno del Frame)."""
-    return max(10.0, content_width(ctx) - 2 * _FRAME_PAD)
+    return _frame_limits(ctx.theme)[0]
 
 
 def _min_frame_effective_height(ctx) -> float:
+    """Altura efectiva mínima garantizada del Frame (ver `_frame_limits`)."""
+    return _frame_limits(ctx.theme)[1]
+
+
+@lru_cache(maxsize=512)
+def _image_dims(path: str, mtime_ns: int, size: int) -> Tuple[float, float]:
+    """Tamaño en px de una imagen, cacheado por (ruta, mtime, tamaño).
+
+    `PIL.Image.open` es lazy: lee solo el header, sin decodificar pixels.
     """
-    Altura efectiva mínima garantizada del Frame, considerando:
-    - First vs Later (reserved top distintos)
-    - padding interno del Frame
+    try:
+        from PIL import Image as PILImage
+
+        with PILImage.open(path) as im:
+            w, h = im.size
+    except Exception:
+        img = RLImage(path)
+        w, h = img.imageWidth, img.imageHeight
+    return float(w), float(h)
+
+
+def _prewarm_one(key: Tuple[str, int, int]) -> None:
+    try:
+        _image_dims(*key)
+    except Exception:
+        pass  # fig() reintenta y reporta el error en su momento
+
+
+def prewarm_images(paths: Sequence[Path], *, max_workers: int = 8) -> None:
+    """Llena en paralelo (threads) el cache de `_image_dims` para `paths`.
+
+    Solo lee headers: el costo es la latencia de disco, que los threads solapan.
     """
-    _, page_h = ctx.theme.pagesize
-    h_first = page_h - ctx.theme.bottom_margin - ctx.theme.first_page_reserved_top
-    h_later = page_h - ctx.theme.bottom_margin - ctx.theme.later_page_reserved_top
-    h = float(min(h_first, h_later))
-    return max(10.0, h - 2 * _FRAME_PAD)
+    keys: List[Tuple[str, int, int]] = []
+    for p in dict.fromkeys(paths):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        keys.append((str(p), st.st_mtime_ns, st.st_size))
+    if len(keys) <= 1:
+        for k in keys:
+            _prewarm_one(k)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as ex:
+        list(ex.map(_prewarm_one, keys))
 
 
 def fig(
@@ -96,8 +162,7 @@ def fig(
         return []
 
     # Límites efectivos (Frame)
-    eff_w = _frame_effective_width(ctx)
-    eff_h = _min_frame_effective_height(ctx)
+    eff_w, eff_h = _frame_limits(ctx.theme)
 
     w_limit = float(min(max_w, eff_w) if max_w is not None else eff_w)
     h_limit = float(min(max_h, eff_h) if max_h is not None else eff_h)
@@ -108,8 +173,8 @@ def fig(
         _warn(f"Figura omitida (sin espacio vertical suficiente): {path}")
         return []
 
-    img = RLImage(str(path))
-    iw, ih = float(img.imageWidth), float(img.imageHeight)
+    st = path.stat()
+    iw, ih = _image_dims(str(path), st.st_mtime_ns, st.st_size)
     if iw <= 0 or ih <= 0:
         _warn(f"Figura omitida (dimensiones inválidas): {path}")
         return []
@@ -119,15 +184,15 @@ def fig(
     scale_h = max_img_h / ih
     scale = min(1.0, scale_w, scale_h)
 
-    img.drawWidth = iw * scale
-    img.drawHeight = ih * scale
+    # Con el tamaño ya resuelto, RLImage no abre el archivo hasta dibujarlo.
+    img = RLImage(str(path), width=iw * scale, height=ih * scale)
 
     # El contenedor (Table) debe respetar el ancho efectivo del frame
     t = Table([[img]], colWidths=[w_limit])
     t.setStyle(TableStyle([
         ("ALIGN", (0, 0), (-1, -1), "CENTER"),
         ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("BOX", (0, 0), (-1, -1), 0.5, colors.HexColor(border_color)),
+        ("BOX", (0, 0), (-1, -1), 0.5, hex_color(border_color)),
         ("LEFTPADDING", (0, 0), (-1, -1), pad),
         ("RIGHTPADDING", (0, 0), (-1, -1), pad),
         ("TOPPADDING", (0, 0), (-1, -1), pad),
@@ -195,40 +260,277 @@ def fig_if_asset(
 # ============================================================
 # Figuras desde páginas de PDFs (sin recortar manual)
 # ============================================================
-def pdf_page_to_png(
+# Fracción del área de la página cubierta por imágenes a partir de la cual se exporta JPEG.
+_PHOTO_AREA_RATIO = 0.5
+
+
+def _is_photographic(page) -> bool:
+    """Página "de fotos" (scan/captura): imágenes cubriendo la mayor parte del área.
+
+    Diagramas y texto vectorial quedan en PNG (sin artefactos y más chicos en PNG).
+    """
+    try:
+        infos = page.get_image_info()
+    except Exception:
+        return False
+    if not infos:
+        return False
+    r = page.rect
+    page_area = float(r.width * r.height) or 1.0
+    covered = 0.0
+    for info in infos:
+        x0, y0, x1, y1 = info.get("bbox", (0, 0, 0, 0))
+        covered += max(0.0, x1 - x0) * max(0.0, y1 - y0)
+    return covered / page_area >= _PHOTO_AREA_RATIO
+
+
+def _cached_page(out_png: Path) -> Optional[Path]:
+    """PNG o JPEG ya exportado para `out_png` (la extensión la decide el export)."""
+    if out_png.is_file():
+        return out_png
+    jpg = out_png.with_suffix(".jpg")
+    if jpg.is_file():
+        return jpg
+    return None
+
+
+@lru_cache(maxsize=1)
+def _fitz():
+    """Módulo PyMuPDF, o None si no está instalado (import diferido y una sola vez)."""
+    try:
+        import fitz  # type: ignore
+    except Exception:
+        return None
+    return fitz
+
+
+# Documents de PyMuPDF abiertos: ruta -> ((mtime_ns, tamaño), Document). Abrir un PDF parsea
+# su xref y varias [FIG] del mismo PDF reusan el Document, pero cada uno deja el archivo
+# abierto (en Windows, bloqueado): se cierra si el PDF cambia, al desalojarse, y todos al
+# terminar cada documento (`close_open_pdfs`, lo llama `compile_txt`).
+_OPEN_PDFS: "OrderedDict[str, Tuple[Tuple[int, int], Any]]" = OrderedDict()
+_OPEN_PDFS_MAX = 16
+
+
+def _load_pdf(pdf_path: Path):
+    st = pdf_path.stat()
+    key, stamp = str(pdf_path), (st.st_mtime_ns, st.st_size)
+    hit = _OPEN_PDFS.pop(key, None)
+    if hit is not None:
+        if hit[0] == stamp:
+            _OPEN_PDFS[key] = hit
+            return hit[1]
+        hit[1].close()
+    doc = _fitz().open(key)
+    _OPEN_PDFS[key] = (stamp, doc)
+    while len(_OPEN_PDFS) > _OPEN_PDFS_MAX:
+        _OPEN_PDFS.popitem(last=False)[1][1].close()
+    return doc
+
+
+def close_open_pdfs() -> None:
+    """Cierra los PDFs fuente que quedaron abiertos (ver `_load_pdf`)."""
+    while _OPEN_PDFS:
+        _OPEN_PDFS.popitem()[1][1].close()
+
+
+def _export_page(
     pdf_path: Path,
     page_1based: int,
     out_png: Path,
     *,
     zoom: float = 2.0,
-) -> bool:
-    if out_png.is_file():
-        return True
+    fmt: str = "auto",
+) -> Optional[Path]:
+    """Exporta la página y retorna la ruta escrita (`.png` o `.jpg`), o None si falló.
+
+    fmt: "png" | "jpeg" | "auto" (JPEG q=85 para páginas fotográficas, PNG para el resto).
+    """
+    hit = _cached_page(out_png)
+    if hit is not None:
+        return hit
 
     if not pdf_path.is_file():
         _warn(f"PDF fuente no existe para exportar página: {pdf_path}")
-        return False
+        return None
 
-    try:
-        import fitz  # type: ignore
-    except Exception:
+    fitz = _fitz()
+    if fitz is None:
         _warn("PyMuPDF (fitz) no está instalado. Se omiten figuras desde PDF.")
-        return False
+        return None
 
     out_png.parent.mkdir(parents=True, exist_ok=True)
+    tmp: Optional[Path] = None
 
-    doc = fitz.open(pdf_path)
     try:
-        page = doc.load_page(page_1based - 1)
+        page = _load_pdf(pdf_path).load_page(page_1based - 1)
+        jpeg = fmt == "jpeg" or (fmt == "auto" and _is_photographic(page))
+        out = out_png.with_suffix(".jpg") if jpeg else out_png
+        # Escritura atómica: otro proceso (--jobs) puede estar exportando la misma página;
+        # nunca debe ver un archivo a medio escribir.
+        tmp = out.with_name(f".{out.stem}.{os.getpid()}.tmp{out.suffix}")
         mat = fitz.Matrix(zoom, zoom)
         pix = page.get_pixmap(matrix=mat, alpha=False)
-        pix.save(str(out_png))
-        return True
+        if jpeg:
+            pix.save(str(tmp), output="jpeg", jpg_quality=85)
+        else:
+            pix.save(str(tmp))
+        os.replace(tmp, out)
+        return out
     except Exception as e:
         _warn(f"No se pudo exportar {pdf_path} pág. {page_1based}: {type(e).__name__}: {e}")
-        return False
+        return None
     finally:
-        doc.close()
+        if tmp is not None and tmp.exists():
+            tmp.unlink()
+
+
+def pdf_page_to_png(
+    pdf_path: Path,
+    page_1based: int,
+    out_png: Path,
+    *,
+    zoom: float = 2.0,
+    fmt: str = "auto",
+) -> bool:
+    """Exporta una página a `out_png` (o a `out_png` con `.jpg` si es fotográfica, ver `fmt`)."""
+    return _export_page(pdf_path, page_1based, out_png, zoom=zoom, fmt=fmt) is not None
+
+
+def pdf_pages_to_pngs(
+    pdf_path: Path,
+    pages: Sequence[Tuple[int, Path, float]],
+    *,
+    fmt: str = "auto",
+) -> List[Optional[Path]]:
+    """Exporta varias `(página, out_png, zoom)` de un mismo PDF (se abre una sola vez)."""
+    return [_export_page(pdf_path, page, out, zoom=zoom, fmt=fmt) for page, out, zoom in pages]
+
+
+@lru_cache(maxsize=256)
+def _pdf_digest(pdf_path: Path, mtime_ns: int, size: int) -> str:
+    # Cabecera + tamaño alcanza para distinguir PDFs homónimos sin leer el archivo entero.
+    with open(pdf_path, "rb") as f:
+        head = f.read(4096)
+    return hashlib.sha1(head + str(size).encode("ascii")).hexdigest()[:12]
+
+
+def _page_cache_key(pdf_path: Path) -> str:
+    """Nombre de subcarpeta del cache: `<stem>-<sha1[:12]>` (o solo `<stem>` si no existe)."""
+    try:
+        st = pdf_path.stat()
+    except OSError:
+        return pdf_path.stem
+    return f"{pdf_path.stem}-{_pdf_digest(pdf_path, st.st_mtime_ns, st.st_size)}"
+
+
+def page_png_path(pdf_path: Path, page_1based: int, *, zoom: float = 2.0, cache_dir: Optional[Path] = None) -> Path:
+    """Ruta del PNG cacheado para (pdf, página, zoom)."""
+    cd = cache_dir if cache_dir is not None else (Path.cwd() / "assets" / "_pdfpages")
+    return cd / _page_cache_key(pdf_path) / f"p{page_1based:03d}_z{zoom:g}.png"
+
+
+@lru_cache(maxsize=256)
+def _page_width(pdf_path: Path, page_1based: int, mtime_ns: int) -> Optional[float]:
+    if _fitz() is None:
+        return None
+    try:
+        return float(_load_pdf(pdf_path).load_page(page_1based - 1).rect.width)
+    except Exception:
+        return None
+
+
+def raster_zoom(pdf_path: Path, page_1based: int, *, zoom: float = 2.0, target_w: float) -> float:
+    """Zoom efectivo de exportación: `zoom`, pero sin pasar de 2 px por punto del ancho final.
+
+    Una página de 720 pt que se dibuja a 460 pt no necesita rasterizarse a 1440 px.
+    Se redondea a 2 decimales para que el nombre en cache sea estable.
+    """
+    try:
+        st = pdf_path.stat()
+    except OSError:
+        return zoom
+    pw = _page_width(pdf_path, page_1based, st.st_mtime_ns)
+    if not pw or target_w <= 0:
+        return zoom
+    return min(zoom, round(2.0 * target_w / pw, 2))
+
+
+def fig_page_png_path(
+    theme,
+    pdf_path: Path,
+    page_1based: int,
+    *,
+    zoom: float = 2.0,
+    cache_dir: Optional[Path] = None,
+    max_w: Optional[float] = None,
+) -> Tuple[Path, float]:
+    """`(png, zoom_efectivo)` con que `fig_pdf_page` exporta la página (lo usa también el prerender)."""
+    eff_w, _ = _frame_limits(theme)
+    target_w = min(max_w, eff_w) if max_w is not None else eff_w
+    z = raster_zoom(pdf_path, page_1based, zoom=zoom, target_w=target_w)
+    return page_png_path(pdf_path, page_1based, zoom=z, cache_dir=cache_dir), z
+
+
+# ProcessPoolExecutor por tope de workers, compartidos por todo el run (ver _prerender_pool).
+_PRERENDER_POOLS: Dict[int, Any] = {}
+
+
+def _prerender_pool(workers: int):
+    """Pool de `workers` procesos para exportar páginas, creado una vez y reusado entre documentos.
+
+    Usa "spawn": el proceso padre puede tener threads vivos (prefetch de assets) y un fork
+    con threads a mitad de un `open`/`readinto` puede colgar al hijo. Los hijos arrancan
+    limpios, sin Documents de PyMuPDF heredados del padre. Los pools se cierran al salir
+    (`shutdown_prerender_pools`, registrado con atexit).
+    """
+    pool = _PRERENDER_POOLS.get(workers)
+    if pool is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        if not _PRERENDER_POOLS:
+            atexit.register(shutdown_prerender_pools)
+        pool = _PRERENDER_POOLS[workers] = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return pool
+
+
+def shutdown_prerender_pools() -> None:
+    """Cierra los pools de prerender (espera a los hijos). Uno nuevo se crea si se vuelve a usar."""
+    atexit.unregister(shutdown_prerender_pools)
+    while _PRERENDER_POOLS:
+        _, pool = _PRERENDER_POOLS.popitem()
+        pool.shutdown()
+
+
+def _prerender_one(item: Tuple[Path, int, Path, float]) -> bool:
+    pdf_path, page, out_png, zoom = item
+    try:
+        return pdf_page_to_png(pdf_path, page, out_png, zoom=zoom)
+    finally:
+        close_open_pdfs()  # los hijos del pool viven todo el run: que no retengan PDFs
+
+
+def prerender_pages(items: Sequence[Tuple[Path, int, Path, float]], *, max_workers: Optional[int] = None) -> None:
+    """Exporta en paralelo (procesos) las páginas `(pdf, página, png, zoom)` que falten en cache.
+
+    Después `fig_pdf_page` encuentra el PNG ya hecho. Los errores se reportan igual que en
+    `pdf_page_to_png` (warning) y no cortan el resto. Con `max_workers <= 1` (o una sola
+    página pendiente) corre en el proceso actual; si no, usa el pool compartido del run.
+    """
+    todo = [it for it in dict.fromkeys(items) if _cached_page(it[2]) is None]
+    cap = max_workers or os.cpu_count() or 1
+    if min(cap, len(todo)) <= 1:
+        for it in todo:
+            _prerender_one(it)
+        return
+
+    # El pool se indexa por el tope pedido (no por min(tope, páginas)) para reusarlo entre
+    # documentos; con spawn los hijos se crean a demanda, nunca más que páginas enviadas.
+    list(_prerender_pool(cap).map(_prerender_one, todo))
 
 
 def fig_pdf_page(
@@ -245,16 +547,21 @@ def fig_pdf_page(
     border_color: str = "#E0E0E0",
     pad: int = 6,
 ) -> List[Flowable]:
-    cd = cache_dir if cache_dir is not None else (Path.cwd() / "assets" / "_pdfpages")
-    out_png = cd / pdf_path.stem / f"p{page_1based:03d}_z{zoom:g}.png"
-
-    ok = pdf_page_to_png(pdf_path, page_1based, out_png, zoom=zoom)
-    if not ok:
+    # La misma página citada varias veces en el documento se resuelve una sola vez (stat, zoom,
+    # cache en disco). Los flowables se arman de nuevo en cada cita: no se comparten en la story.
+    key = (pdf_path, page_1based, zoom, cache_dir, max_w)
+    resolved = ctx._fig_pages
+    if key in resolved:
+        out_img = resolved[key]
+    else:
+        out_png, z = fig_page_png_path(ctx.theme, pdf_path, page_1based, zoom=zoom, cache_dir=cache_dir, max_w=max_w)
+        out_img = resolved[key] = _export_page(pdf_path, page_1based, out_png, zoom=z)
+    if out_img is None:
         return []
 
     return fig(
         ctx,
-        out_png,
+        out_img,
         caption,
         max_w=max_w,
         max_h=max_h,
@@ -2,37 +2,57 @@
 
 from __future__ import annotations
 
+import io
 from pathlib import Path
 from typing import Callable, List, Optional, Any
 
 from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, PageBreak
 from reportlab.platypus.tableofcontents import TableOfContents
 from reportlab.platypus.paragraph import Paragraph
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfgen import canvas as canv
 
-from ..runtime.core import DocSpec, PdfTheme
+from ..runtime.core import DEFAULT_THEME, DocSpec, PdfTheme
 from ..runtime.ctx import PdfCtx
 from ..runtime.utils import exists, hex_color, safe_draw_image
 from .txtfmt import sanitize_para, sanitize_plain
 
 Flowable = Any
 
+_FOOTER_FONT = ("Helvetica", 9)
+_FOOTER_Y = 22
+_AUTHOR_NAME = "Lucas Borges"
+_AUTHOR_URL = "https://www.linkedin.com/in/lucasborges0109"
+_TOC_LINK_W = 240
+_TOC_LINK_H = 12
+
+_STYLE_LEVELS = {"H1": 0, "H2": 1, "H3": 2}
+
 
 class FbdDocTemplate(BaseDocTemplate):
     def __init__(self, *args, toc: Optional[TableOfContents] = None, toc_max_level: int = 3, **kwargs):
         super().__init__(*args, **kwargs)
         self._toc = toc
         self._toc_max_level = toc_max_level
+        self._auto_key = 0
+
+    def beforeDocument(self) -> None:
+        # multiBuild repite el layout: reiniciar el contador deja las mismas keys en cada pasada
+        # (el TOC de la pasada N linkea a las keys de la pasada N-1).
+        self._auto_key = 0
+        # Cada pasada guarda el PDF completo: si el destino es un buffer, sólo queda la última.
+        if isinstance(self.filename, io.BytesIO):
+            self.filename.seek(0)
+            self.filename.truncate()
 
     def afterFlowable(self, flowable: Flowable) -> None:
         if not isinstance(flowable, Paragraph):
             return
 
-        skip_toc = bool(getattr(flowable, "_fbd_skip_toc", False))
-        skip_outline = bool(getattr(flowable, "_fbd_skip_outline", False))
-
-        level = getattr(flowable, "_fbd_level", None)
-        key = getattr(flowable, "_fbd_key", None)
+        # Atributos _fbd_* leídos una vez del __dict__ (los párrafos de cuerpo no tienen ninguno).
+        attrs = flowable.__dict__
+        key = attrs.get("_fbd_key")
+        level = attrs.get("_fbd_level")
 
         # Si tiene key explícita, siempre intentamos generar el bookmark (aunque se saltee TOC/outline)
         if key:
@@ -41,27 +61,23 @@ class FbdDocTemplate(BaseDocTemplate):
             except Exception:
                 pass
 
-        # Si se saltea todo y no hay bookmark que crear, no hacemos nada más
-        if skip_toc and skip_outline and not key:
+        # Si se saltea TOC y outline no queda nada más por hacer (el bookmark, si había key, ya está)
+        skip_toc = attrs.get("_fbd_skip_toc", False)
+        skip_outline = attrs.get("_fbd_skip_outline", False)
+        if skip_toc and skip_outline:
             return
 
         if level is None:
-            st = getattr(flowable.style, "name", "")
-            if st == "H1":
-                level = 0
-            elif st == "H2":
-                level = 1
-            elif st == "H3":
-                level = 2
-
-        if level is None:
-            return
+            level = _STYLE_LEVELS.get(getattr(flowable.style, "name", ""))
+            if level is None:
+                return
 
         toc_level = max(0, min(int(level), self._toc_max_level - 1))
         text = flowable.getPlainText()
 
         if not key:
-            key = f"sec-{self.page}-{abs(hash(text)) % 10_000_000}"
+            self._auto_key += 1
+            key = f"sec-{self.page}-{self._auto_key}"
             try:
                 self.canv.bookmarkPage(key)
             except Exception:
@@ -84,85 +100,74 @@ def build_pdf(
     build_content: Callable[[PdfCtx], List[Flowable]],
     theme: Optional[PdfTheme] = None,
 ) -> Path:
-    theme = theme or PdfTheme()
+    theme = theme if theme is not None else DEFAULT_THEME
     ctx = PdfCtx(theme)
 
     page_w, page_h = theme.pagesize
 
-    def draw_footer(c: canv.Canvas, doc):
-        c.setFont("Helvetica", 9)
-        c.setFillColor(hex_color(theme.footer_color))
-        y = 22
+    # Todo lo que no depende de la página se resuelve una vez, fuera de los callbacks.
+    footer_color = hex_color(theme.footer_color)
+    line_color = hex_color(theme.line_color)
+    footer_left = sanitize_plain(spec.footer_left or spec.system or "")
+    footer_center = sanitize_plain(spec.footer_center or spec.contacto or "")
+    footer_right = sanitize_plain(spec.footer_right) if spec.footer_right else ""
+    y = _FOOTER_Y
+    center_x = (page_w - stringWidth(footer_center, *_FOOTER_FONT)) / 2
+    author_rect = None
+    if footer_left.strip() == _AUTHOR_NAME:
+        author_rect = (theme.left_margin, y - 2, theme.left_margin + stringWidth(footer_left, *_FOOTER_FONT), y + 10)
+    toc_x0 = (page_w / 2) - (_TOC_LINK_W / 2)
+    toc_rect = (toc_x0, y - 2, toc_x0 + _TOC_LINK_W, y - 2 + _TOC_LINK_H)
 
-        left = sanitize_plain(spec.footer_left or spec.system or "")
-        center = sanitize_plain(spec.footer_center or spec.contacto or "")
+    def draw_footer(c: canv.Canvas, doc):
 
         right_bits: List[str] = []
-        if spec.footer_right:
-            right_bits.append(sanitize_plain(spec.footer_right))
+        if footer_right:
+            right_bits.append(footer_right)
         if spec.footer_show_page:
             right_bits.append(f"Página {doc.page}")
         right = " · ".join(right_bits).strip()
 
-        if left:
-            c.drawString(theme.left_margin, y, left)
-
-            if left.strip() == "Lucas Borges":
-                text_width = c.stringWidth(left, "Helvetica", 9)
-                c.linkURL(
-                    "https://www.linkedin.com/in/lucasborges0109",
-                    (
-                        theme.left_margin,
-                        y - 2,
-                        theme.left_margin + text_width,
-                        y + 10,
-                    ),
-                    relative=0,
-                    thickness=0,
-                )
-
-
-        if center:
-            c.drawCentredString(page_w / 2, y, center)
-            if spec.include_toc and spec.footer_link_to_toc and doc.page >= 2:
-                w = 240
-                h = 12
-                x0 = (page_w / 2) - (w / 2)
-                y0 = y - 2
-                c.linkRect("", "toc", (x0, y0, x0 + w, y0 + h), relative=0, thickness=0)
-
+        # Un único objeto de texto (un BT/ET) con fuente y color fijados una sola vez.
+        t = c.beginText()
+        t.setFont(*_FOOTER_FONT)
+        t.setFillColor(footer_color)
+        if footer_left:
+            t.setTextOrigin(theme.left_margin, y)
+            t.textOut(footer_left)
+        if footer_center:
+            t.setTextOrigin(center_x, y)
+            t.textOut(footer_center)
         if right:
-            c.drawRightString(page_w - theme.right_margin, y, right)
+            t.setTextOrigin(page_w - theme.right_margin - stringWidth(right, *_FOOTER_FONT), y)
+            t.textOut(right)
+        c.drawText(t)
+
+        if author_rect is not None:
+            c.linkURL(_AUTHOR_URL, author_rect, relative=0, thickness=0)
+
+        if footer_center and spec.include_toc and spec.footer_link_to_toc and doc.page >= 2:
+            c.linkRect("", "toc", toc_rect, relative=0, thickness=0)
+
+    header_y = page_h - theme.header_line_y_offset
+    header_line = (theme.header_line_inset, header_y, page_w - theme.header_line_inset, header_y)
+    # exists() hace stat: se resuelve una vez y no en cada pasada de multiBuild
+    header_images = []
+    if exists(spec.logo_left):
+        header_images.append((spec.logo_left, theme.left_margin, header_y - 18, 220))
+    if exists(spec.icon_right):
+        icon_w = 52
+        header_images.append((spec.icon_right, page_w - theme.right_margin - icon_w, header_y - 20, icon_w))
 
     def draw_header_line(c: canv.Canvas):
-        c.setStrokeColor(hex_color(theme.line_color))
+        c.setStrokeColor(line_color)
         c.setLineWidth(1)
-        y = page_h - theme.header_line_y_offset
-        c.line(theme.header_line_inset, y, page_w - theme.header_line_inset, y)
+        c.line(*header_line)
 
     def on_first_page(c: canv.Canvas, doc):
         draw_header_line(c)
-        header_y = page_h - theme.header_line_y_offset
-
-        if exists(spec.logo_left):
-            safe_draw_image(
-                c,
-                spec.logo_left,  # type: ignore[arg-type]
-                theme.left_margin,
-                header_y - 18,
-                w=220,
-            )
-
-        if exists(spec.icon_right):
-            icon_w = 52
-            safe_draw_image(
-                c,
-                spec.icon_right,  # type: ignore[arg-type]
-                page_w - theme.right_margin - icon_w,
-                header_y - 20,
-                w=icon_w,
-            )
-
+        for path, x, y, w in header_images:
+            safe_draw_image(c, path, x, y, w=w)  # type: ignore[arg-type]
         draw_footer(c, doc)
 
     def on_later_pages(c: canv.Canvas, doc):
@@ -202,17 +207,20 @@ def build_pdf(
 
     story.extend(build_content(ctx))
 
+    # Se arma en memoria y se escribe una sola vez al final: las pasadas intermedias de
+    # multiBuild no tocan el disco y un build que falla no deja un PDF a medias.
+    buf = io.BytesIO()
     doc = FbdDocTemplate(
-        str(spec.out_path),
+        buf,
         pagesize=theme.pagesize,
         leftMargin=theme.left_margin,
         rightMargin=theme.right_margin,
         topMargin=theme.top_margin,
         bottomMargin=theme.bottom_margin,
         title=sanitize_plain(spec.title),
-        author=spec.author or "Lucas Borges",
-        subject=spec.subject or "",
-        keywords=spec.keywords or "",
+        author=spec.author,
+        subject=spec.subject,
+        keywords=spec.keywords,
         toc=toc,
         toc_max_level=spec.toc_max_level,
     )
@@ -257,4 +265,5 @@ def build_pdf(
     else:
         doc.build(story)
 
+    spec.out_path.write_bytes(buf.getvalue())
     return spec.out_path
@@ -45,6 +45,8 @@ _MIN_SPACE_BEFORE_CALLOUT = 180
 _MIN_SPACE_BEFORE_FIG = 260
 _MIN_SPACE_BEFORE_CODE = 140
 
+_UL_PREFIXES = ("- ", "* ", "• ")
+
 
 # ------------------------------
 # Controller helpers
@@ -125,12 +127,13 @@ def _append_block_construct(
     title = (mb.group("title") or "").strip() or None
 
     body_lines: List[str] = []
+    append = body_lines.append
     i = start + 1
     while i < len(lines):
         raw2 = lines[i].rstrip("\n")
         if BLOCK_CLOSE_RE.match(raw2.strip()):
             break
-        body_lines.append(raw2)
+        append(raw2)
         i += 1
 
     if i < len(lines) and BLOCK_CLOSE_RE.match(lines[i].strip()):
@@ -138,8 +141,7 @@ def _append_block_construct(
 
     if kind_raw == "table":
         rows, aligns = parse_pipe_table(body_lines)
-        story.append(ctx.table(rows, header=True, aligns=aligns))
-        story.append(ctx.sp(6))
+        story.extend((ctx.table(rows, header=True, aligns=aligns), ctx.sp(6)))
         return i
 
     kind_map = {
@@ -159,8 +161,7 @@ def _append_block_construct(
     body_flow = parse_block(body_lines, True) if body_lines else [ctx.p("", ctx.base)]
 
     condbreak(story, _MIN_SPACE_BEFORE_CALLOUT)
-    story.append(ctx.callout(call_kind, final_title, body_flow))
-    story.append(ctx.sp(10))
+    story.extend((ctx.callout(call_kind, final_title, body_flow), ctx.sp(10)))
     return i
 
 
@@ -182,6 +183,7 @@ def _append_legacy_callout(
     title = mco.group("title") or None
 
     body_lines: List[str] = []
+    append = body_lines.append
     i = start + 1
     while i < len(lines):
         raw2 = lines[i].rstrip("\n")
@@ -189,7 +191,7 @@ def _append_legacy_callout(
         mclose = CALLOUT_CLOSE_RE.match(line2)
         if mclose and mclose.group("kind").lower() == kind:
             break
-        body_lines.append(raw2)
+        append(raw2)
         i += 1
 
     if i < len(lines) and CALLOUT_CLOSE_RE.match(lines[i].strip()):
@@ -205,8 +207,7 @@ def _append_legacy_callout(
         "check": "info",
     }
     condbreak(story, _MIN_SPACE_BEFORE_CALLOUT)
-    story.append(ctx.callout(kmap.get(kind, "info"), title, body_flow))
-    story.append(ctx.sp(10))
+    story.extend((ctx.callout(kmap.get(kind, "info"), title, body_flow), ctx.sp(10)))
     return i
 
 
@@ -279,9 +280,11 @@ def _append_code_fence(ctx: PdfCtx, story: List[Flowable], lines: List[str], sta
 
     lang = (mf.group("lang") or "").strip()
     block: List[str] = []
+    append = block.append
+    close = FENCE_CLOSE_RE.match
     i = start + 1
-    while i < len(lines) and not FENCE_CLOSE_RE.match(lines[i]):
-        block.append(sanitize_code_line(lines[i]))
+    while i < len(lines) and not close(lines[i]):
+        append(sanitize_code_line(lines[i]))
         i += 1
     if i < len(lines) and FENCE_CLOSE_RE.match(lines[i]):
         i += 1
@@ -295,17 +298,18 @@ def _append_code_fence(ctx: PdfCtx, story: List[Flowable], lines: List[str], sta
 
 def _append_unordered_list(ctx: PdfCtx, story: List[Flowable], lines: List[str], start: int) -> Optional[int]:
     raw = lines[start].rstrip("\n")
-    if not raw.lstrip().startswith(("- ", "* ", "• ")):
+    if not raw.lstrip().startswith(_UL_PREFIXES):
         return None
 
     items: List[str] = []
+    append = items.append
     i = start
     while i < len(lines):
         r2 = lines[i].rstrip("\n")
         s2 = r2.lstrip()
-        if not s2.startswith(("- ", "* ", "• ")):
+        if not s2.startswith(_UL_PREFIXES):
             break
-        items.append(sanitize_para(s2[2:]))
+        append(sanitize_para(s2[2:]))
         i += 1
     story.append(ctx.ul(items))
     return i
@@ -318,13 +322,15 @@ def _append_ordered_list(ctx: PdfCtx, story: List[Flowable], lines: List[str], s
         return None
 
     items: List[str] = []
+    append = items.append
+    match = ORDERED_LIST_RE.match
     i = start
     while i < len(lines):
-        mm = ORDERED_LIST_RE.match(lines[i].strip())
+        s2 = lines[i].strip()
+        mm = match(s2)
         if not mm:
             break
-        item_text = lines[i].strip()[mm.end():]
-        items.append(sanitize_para(item_text))
+        append(sanitize_para(s2[mm.end():]))
         i += 1
     story.append(ctx.ol(items))
     return i
@@ -337,12 +343,13 @@ def _append_indented_code(ctx: PdfCtx, story: List[Flowable], lines: List[str],
         return None
 
     block: List[str] = []
+    append = block.append
     i = start
     while i < len(lines):
         r2 = lines[i].rstrip("\n")
         if not (r2.startswith("    ") or r2.startswith("\t")):
             break
-        block.append(sanitize_code_line(r2[4:] if r2.startswith("    ") else r2[1:]))
+        append(sanitize_code_line(r2[4:] if r2.startswith("    ") else r2[1:]))
         i += 1
 
     condbreak(story, _MIN_SPACE_BEFORE_CODE)
@@ -351,41 +358,59 @@ def _append_indented_code(ctx: PdfCtx, story: List[Flowable], lines: List[str],
 
 
 
+# Primer carácter (ya sin espacios) con el que puede empezar alguna construcción de bloque:
+# [PB]/[FIG]/[IMG]/[NOTE], :::, reglas ===/---, listas -/*/•, fences ```, títulos y pasos
+# numerados. Una línea que no arranca con ninguno (ni con sangría) es texto de párrafo.
+_STRUCT_START = frozenset("[:=-*•`0123456789")
+
+
+def _is_plain_text(raw: str, line: str) -> bool:
+    # `\d` de los regex de títulos/listas/pasos acepta cualquier dígito Unicode ("０. x"):
+    # isdecimal() cubre la misma clase.
+    c = line[:1]
+    return raw[:1] not in (" ", "\t") and c not in _STRUCT_START and not c.isdecimal()
+
+
 def _paragraph_should_stop(peek_raw: str) -> bool:
     peek = peek_raw.strip()
     if not peek:
         return True
-    if PB_RE.match(peek):
-        return True
-    if parse_fig_marker(peek) or parse_img_marker(peek):
-        return True
-    if BLOCK_OPEN_RE.match(peek) or CALLOUT_OPEN_RE.match(peek):
-        return True
-    if is_eq_rule(peek) or is_dash_rule(peek):
-        return True
-    if HEADING_DOT_RE.match(peek):
-        return True
-    if FENCE_OPEN_RE.match(peek_raw):
-        return True
-    if peek_raw.lstrip().startswith(("- ", "* ", "• ")):
-        return True
-    if ORDERED_LIST_RE.match(peek):
-        return True
+    if _is_plain_text(peek_raw, peek):
+        return False
     if peek_raw.startswith("    ") or peek_raw.startswith("\t"):
         return True
-    return False
+
+    # Cada construcción tiene un único primer carácter posible: sólo se prueban las que aplican.
+    c = peek[0]
+    if c == "[":
+        return bool(
+            PB_RE.match(peek)
+            or CALLOUT_OPEN_RE.match(peek)
+            or parse_fig_marker(peek)
+            or parse_img_marker(peek)
+        )
+    if c == ":":
+        return bool(BLOCK_OPEN_RE.match(peek))
+    if c == "=":
+        return is_eq_rule(peek)
+    if c == "`":
+        return bool(FENCE_OPEN_RE.match(peek_raw))
+    if c in "-*•":
+        return peek_raw.lstrip().startswith(_UL_PREFIXES) or is_dash_rule(peek)
+    return bool(HEADING_DOT_RE.match(peek) or ORDERED_LIST_RE.match(peek))
 
 
 
 def _append_paragraph(ctx: PdfCtx, story: List[Flowable], lines: List[str], start: int) -> int:
     first = lines[start].rstrip("\n").strip()
     parts: List[str] = [sanitize_para(first)]
+    append = parts.append
     i = start + 1
     while i < len(lines):
         peek_raw = lines[i].rstrip("\n")
         if _paragraph_should_stop(peek_raw):
             break
-        parts.append(sanitize_para(peek_raw.strip()))
+        append(sanitize_para(peek_raw.strip()))
         i += 1
     story.append(ctx.p(" ".join(parts)))
     return i
@@ -406,22 +431,40 @@ def txt_to_flowables(
     _used_keys: Optional[Dict[str, int]] = None,
     _in_callout: bool = False,
 ) -> List[Flowable]:
-    lines = text.splitlines()
-    story: List[Flowable] = []
     used_keys: Dict[str, int] = _used_keys if _used_keys is not None else {}
 
+    # Un solo parse_block por documento: los bloques anidados lo reciben ya armado y le pasan
+    # sus líneas tal cual (sin "\n".join → splitlines).
     def parse_block(block_lines: List[str], in_callout: bool = False) -> List[Flowable]:
-        return txt_to_flowables(
+        return _lines_to_flowables(
             ctx,
-            "\n".join(block_lines),
+            block_lines,
             resolve_pdf=resolve_pdf,
             resolve_img=resolve_img,
             cache_dir=cache_dir,
             default_zoom=default_zoom,
-            _used_keys=used_keys,
-            _in_callout=in_callout,
+            used_keys=used_keys,
+            in_callout=in_callout,
+            parse_block=parse_block,
         )
 
+    return parse_block(text.splitlines(), _in_callout)
+
+
+def _lines_to_flowables(
+    ctx: PdfCtx,
+    lines: List[str],
+    *,
+    resolve_pdf: Callable[[str], Path],
+    resolve_img: Optional[Callable[[str], Path]],
+    cache_dir: Optional[Path],
+    default_zoom: float,
+    used_keys: Dict[str, int],
+    in_callout: bool,
+    parse_block: Callable[[List[str], bool], List[Flowable]],
+) -> List[Flowable]:
+    story: List[Flowable] = []
+
     i = 0
     while i < len(lines):
         raw = lines[i].rstrip("\n")
@@ -431,6 +474,10 @@ def txt_to_flowables(
             i += 1
             continue
 
+        if _is_plain_text(raw, line):
+            i = _append_paragraph(ctx, story, lines, i)
+            continue
+
         if PB_RE.match(line):
             _append_explicit_pagebreak(story)
             i += 1
@@ -464,7 +511,7 @@ def txt_to_flowables(
             lines,
             i,
             used_keys=used_keys,
-            in_callout=_in_callout,
+            in_callout=in_callout,
         )
         if next_i is not None:
             i = next_i
@@ -480,7 +527,7 @@ def txt_to_flowables(
             story.extend(flows)
             continue
 
-        if _append_dot_heading(ctx, story, line, used_keys=used_keys, in_callout=_in_callout):
+        if _append_dot_heading(ctx, story, line, used_keys=used_keys, in_callout=in_callout):
             i += 1
             continue
 
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import re
 import unicodedata
+from functools import lru_cache
 from typing import List
-from xml.sax.saxutils import escape as _xml_escape
 
 _REPLACEMENTS = [
     ("⊕", " XOR "),
@@ -39,44 +39,81 @@ _REPLACEMENTS = [
     ("÷", "DIV"),
 ]
 
+# Igual que xml.sax.saxutils.escape sin entidades extra; importar saxutils arrastra
+# urllib.request (http.client, ssl, email): ~17 ms de import para tres replace.
+def _xml_escape(s: str) -> str:
+    return s.replace("&", "&amp;").replace(">", "&gt;").replace("<", "&lt;")
+
+
 _BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
 _CODE_RE = re.compile(r"`([^`]+)`")
 _ITALIC_RE = re.compile(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)")
-
-
+_WS_RE = re.compile(r"\s+")
+
+# Funciones puras de un solo str: títulos de callouts, encabezados de tabla, ítems y
+# líneas de código se repiten mucho dentro de un documento (y entre documentos).
+_CACHE_SIZE = 8192
+
+
+# Invisibles que se eliminan antes de reemplazar (pueden partir una frase como "🟢 OK").
+_INVISIBLE = ("\u200d", "\ufe0f", "\ufe0e", "\u200b")
+
+_EMOJI_MAP = {
+    "🟢": "OK",
+    "🟡": "WARN",
+    "🔴": "CRIT",
+    "✅": "OK",
+    "❌": "NO",
+    "⚠": "WARN",
+    "ℹ": "INFO",
+    "💡": "TIP",
+}
+
+# Secuencias de más de un carácter: van antes que sus caracteres sueltos.
+_MULTI = {
+    "🟢 OK": "OK",
+    "🟡 WARN": "WARN",
+    "🔴 CRIT": "CRIT",
+    **{a: b for a, b in _REPLACEMENTS if len(a) > 1},
+}
+
+# El resto es carácter -> texto: una sola pasada de regex (clase de caracteres) con lookup
+# en dict, en vez de ~40 `replace`. Las identidades de _REPLACEMENTS se omiten; lo que cae
+# en el rango emoji y no está en la tabla se borra.
+# No se usa str.translate: con la tabla completa (rangos emoji incluidos) da lo mismo, pero
+# recorre y copia todo el string aunque no haya nada que cambiar, y en prosa con tildes sin
+# símbolos (el caso común) es 2-4x más lenta que esta regex, que sin matches no copia nada.
+_NORM_TABLE = {**{a: b for a, b in _REPLACEMENTS if len(a) == 1 and a != b}, **_EMOJI_MAP}
+_NORM_RE = re.compile(
+    "[" + "".join(re.escape(k) for k in _NORM_TABLE) + "\U0001F300-\U0001FAFF\U00002600-\U000027BF]"
+)
+
+
+def _norm_sub(m: re.Match[str]) -> str:
+    return _NORM_TABLE.get(m.group(0), "")
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
 def _normalize_unicode(s: str) -> str:
     out = unicodedata.normalize("NFKC", s or "")
-    out = out.replace("\u200d", "")
-    out = out.replace("\ufe0f", "")
-    out = out.replace("\ufe0e", "")
-    out = out.replace("\u200b", "")
-
-    out = out.replace("🟢 OK", "OK")
-    out = out.replace("🟡 WARN", "WARN")
-    out = out.replace("🔴 CRIT", "CRIT")
-
-    for a, b in _REPLACEMENTS:
-        out = out.replace(a, b)
-
-    emoji_map = {
-        "🟢": "OK",
-        "🟡": "WARN",
-        "🔴": "CRIT",
-        "✅": "OK",
-        "❌": "NO",
-        "⚠": "WARN",
-        "ℹ": "INFO",
-        "💡": "TIP",
-    }
-    for a, b in emoji_map.items():
-        out = out.replace(a, b)
-
-    out = re.sub(r"[\U0001F300-\U0001FAFF\U00002600-\U000027BF]", "", out)
-    return out
-
-
+    if out.isascii():
+        return out  # ninguna clave es ASCII (salvo identidades)
+    for z in _INVISIBLE:
+        if z in out:
+            out = out.replace(z, "")
+    for a, b in _MULTI.items():
+        if a in out:
+            out = out.replace(a, b)
+    return _NORM_RE.sub(_norm_sub, out)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
 def _inline_rl(text: str) -> str:
     t = _xml_escape(_normalize_unicode(text))
+    # Caso común: línea sin marcas inline, no hay nada que sustituir.
+    has_code = "`" in t
+    if not has_code and "*" not in t:
+        return t
 
     code_spans: List[str] = []
 
@@ -84,9 +121,11 @@ def _inline_rl(text: str) -> str:
         code_spans.append(m.group(1))
         return f"@@CODE{len(code_spans)-1}@@"
 
-    t = _CODE_RE.sub(_stash_code, t)
-    t = _BOLD_RE.sub(r"<b>\1</b>", t)
-    t = _ITALIC_RE.sub(r"<i>\1</i>", t)
+    if has_code:
+        t = _CODE_RE.sub(_stash_code, t)
+    if "*" in t:
+        t = _BOLD_RE.sub(r"<b>\1</b>", t)
+        t = _ITALIC_RE.sub(r"<i>\1</i>", t)
 
     for i, code in enumerate(code_spans):
         t = t.replace(f"@@CODE{i}@@", f'<font face="Courier">{code}</font>')
@@ -94,18 +133,33 @@ def _inline_rl(text: str) -> str:
     return t
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def sanitize_para(line: str) -> str:
     t = _inline_rl(line)
-    t = re.sub(r"\s+", " ", t).strip()
+    t = _WS_RE.sub(" ", t).strip()
     return t
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def sanitize_code_line(line: str) -> str:
-    t = _xml_escape(_normalize_unicode(line.rstrip("\n").replace("\t", "    ")))
+    t = line.rstrip("\n").replace("\t", "    ")
+    # Código casi siempre es ASCII: NFKC y la tabla de reemplazos no cambian nada ahí.
+    if t.isascii():
+        if "&" in t or "<" in t or ">" in t:
+            t = _xml_escape(t)
+    else:
+        t = _xml_escape(_normalize_unicode(t))
     return t.replace(" ", "&nbsp;")
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def sanitize_plain(text: str) -> str:
     t = _normalize_unicode(text or "")
-    t = re.sub(r"\s+", " ", t).strip()
+    t = _WS_RE.sub(" ", t).strip()
     return t
+
+
+def _reset_caches() -> None:
+    """Vacía los caches de normalización/sanitizado (tests)."""
+    for f in (_normalize_unicode, _inline_rl, sanitize_para, sanitize_code_line, sanitize_plain):
+        f.cache_clear()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 from reportlab.platypus import CondPageBreak
@@ -37,19 +38,35 @@ def is_dash_rule(line: str) -> bool:
     return is_rule(line, "-", 5)
 
 
+_SLUG_STRIP_RE = re.compile(r"[^\w\s.-]")
+_SLUG_SEP_RE = re.compile(r"[\s.]+")
+_SLUG_DASH_RE = re.compile(r"-{2,}")
+
+
+@lru_cache(maxsize=1024)
 def slugify(s: str) -> str:
     s = _normalize_unicode(s).lower().strip()
-    s = re.sub(r"[^\w\s.-]", "", s)
-    s = re.sub(r"[\s.]+", "-", s)
-    s = re.sub(r"-{2,}", "-", s).strip("-")
+    s = _SLUG_STRIP_RE.sub("", s)
+    s = _SLUG_SEP_RE.sub("-", s)
+    s = _SLUG_DASH_RE.sub("-", s).strip("-")
     return s or "sec"
 
 
+# `used` guarda las keys ya tomadas (también las con sufijo) y, por slug, el último sufijo
+# asignado: el siguiente se prueba desde ahí.
 def unique_key(base: str, used: Dict[str, int]) -> str:
     k = slugify(base)
-    n = used.get(k, 0)
-    used[k] = n + 1
-    return k if n == 0 else f"{k}-{n+1}"
+    n = used.get(k)
+    if n is None:
+        used[k] = 1
+        return k
+    n += 1
+    while f"{k}-{n}" in used:  # p.ej. "Intro 2" ya tomó "intro-2"
+        n += 1
+    used[k] = n
+    key = f"{k}-{n}"
+    used[key] = 1
+    return key
 
 
 def mk_heading(ctx: PdfCtx, text: str, level: int, key: str, *, in_callout: bool) -> Flowable:
@@ -182,22 +199,22 @@ def pipe_align_from_sep(cell: str) -> Optional[str]:
 
 def parse_pipe_table(body_lines: List[str]) -> Tuple[List[List[str]], Optional[List[Optional[str]]]]:
     raw_rows: List[List[str]] = []
+    append = raw_rows.append
     for ln in body_lines:
         s = ln.strip()
-        if not s or not s.startswith("|"):
-            continue
-        cells = [c.strip() for c in s.strip().strip("|").split("|")]
-        raw_rows.append(cells)
+        if s.startswith("|"):
+            append([c.strip() for c in s.strip("|").split("|")])
 
     if not raw_rows:
         return [[""]], None
 
     aligns: Optional[List[Optional[str]]] = None
-    if len(raw_rows) >= 2 and all(PIPE_SEP_CELL_RE.match(c.strip()) for c in raw_rows[1]):
+    if len(raw_rows) >= 2 and all(map(PIPE_SEP_CELL_RE.match, raw_rows[1])):
         aligns = [pipe_align_from_sep(c) for c in raw_rows[1]]
         raw_rows.pop(1)
 
-    rows = [[sanitize_para(c) for c in r] for r in raw_rows]
+    # sanitize_para está memoizado: celdas repetidas (tablas tipo matriz) salen del cache
+    rows = [list(map(sanitize_para, r)) for r in raw_rows]
     if aligns is not None:
         ncols = max(len(r) for r in rows) if rows else len(aligns)
         aligns = (list(aligns) + [None] * max(0, ncols - len(aligns)))[:ncols]
@@ -63,6 +63,10 @@ class PdfTheme:
     callout_danger_border: str = "#FCA5A5"
 
 
+# Theme por defecto compartido: PdfTheme es inmutable, no hace falta una instancia por documento.
+DEFAULT_THEME = PdfTheme()
+
+
 @dataclass(frozen=True)
 class DocSpec:
     out_path: Path
@@ -82,7 +86,7 @@ class DocSpec:
     contacto: str = ""
 
     # PDF metadata
-    author: str = ""
+    author: str = "Lucas Borges"
     subject: str = ""
     keywords: str = ""
 
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from functools import lru_cache, partial
+from itertools import chain, islice, repeat
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, cast
 
@@ -20,10 +22,75 @@ from ..format import images as img_mod  # para ctx.fig / ctx.asset
 Flowable = Any
 
 
+@lru_cache(maxsize=None)
+def _sample_normal() -> ParagraphStyle:
+    # getSampleStyleSheet() arma ~20 estilos por llamada y solo usamos "Normal" como padre.
+    # Los estilos no se mutan después de construidos, así que se comparte entre PdfCtx.
+    return getSampleStyleSheet()["Normal"]
+
+
+@lru_cache(maxsize=8)
+def _table_styles(theme: PdfTheme) -> Dict[str, TableStyle]:
+    """TableStyles fijos por theme (codeblock, table, callouts, kv).
+
+    `Table.setStyle` copia los comandos, así que una misma instancia se puede aplicar a
+    muchas tablas; lo que depende de argumentos (paddings, aligns) se agrega aparte.
+    """
+    line = hex_color(theme.line_color)
+
+    def box(bg: str, border: str, row_pad: int) -> List[Tuple[Any, ...]]:
+        return [
+            ("BACKGROUND", (0, 0), (-1, -1), hex_color(bg)),
+            ("BOX", (0, 0), (-1, -1), 1, hex_color(border)),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("LEFTPADDING", (0, 0), (-1, -1), 10),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 10),
+            # padding chico por fila para no inflar altura
+            ("TOPPADDING", (0, 0), (-1, -1), row_pad),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), row_pad),
+        ]
+
+    # aire global arriba/abajo del recuadro
+    callout_air = [
+        ("TOPPADDING", (0, 0), (-1, 0), 8),
+        ("BOTTOMPADDING", (0, -1), (-1, -1), 8),
+    ]
+
+    return {
+        "codeblock": TableStyle(box(theme.callout_bg, theme.line_color, 0)),
+        "callout_note": TableStyle(box(theme.callout_note_bg, theme.callout_note_border, 1) + callout_air),
+        "callout_warn": TableStyle(box(theme.callout_warn_bg, theme.callout_warn_border, 1) + callout_air),
+        "callout_danger": TableStyle(box(theme.callout_danger_bg, theme.callout_danger_border, 1) + callout_air),
+        "callout_info": TableStyle(box(theme.callout_bg, theme.callout_border, 1) + callout_air),
+        "table": TableStyle([
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("GRID", (0, 0), (-1, -1), 0.5, line),
+            ("LEFTPADDING", (0, 0), (-1, -1), 6),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+            ("TOPPADDING", (0, 0), (-1, -1), 3),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+        ]),
+        "table_header": TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), hex_color(theme.callout_bg)),
+            ("LINEBELOW", (0, 0), (-1, 0), 1, line),
+        ]),
+        "kv": TableStyle([
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("TEXTCOLOR", (0, 0), (-1, -1), hex_color(theme.muted_color)),
+            ("LINEBELOW", (0, 0), (-1, -1), 0.5, line),
+            ("LEFTPADDING", (0, 0), (-1, -1), 0),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+            ("TOPPADDING", (0, 0), (-1, -1), 3),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+        ]),
+    }
+
+
 class PdfCtx:
     def __init__(self, theme: PdfTheme):
         self.theme = theme
         self.styles = self._build_styles(theme)
+        self._ts = _table_styles(theme)
 
         # Mantener nombres usados por tus scripts
         self.base = self.styles["Base"]
@@ -35,6 +102,12 @@ class PdfCtx:
         self.link = self.styles["Link"]
         self.small = self.styles["Small"]
         self.code = self.styles["Code"]
+        self.table_header = self.styles["TableHeader"]
+        self.small_bold = self.styles["SmallBold"]
+        # Paragraph(texto, style=base) sin pasar por p() (partial despacha en C)
+        self._p_base = partial(Paragraph, style=self.base)
+        # (pdf, página, zoom, cache_dir, max_w) -> imagen exportada; lo llena images.fig_pdf_page
+        self._fig_pages: Dict[Tuple[Any, ...], Optional[Path]] = {}
 
         # TOC styles (usados por render.py si include_toc=True)
         self.toc0 = self.styles["TOC0"]
@@ -43,11 +116,9 @@ class PdfCtx:
 
     @staticmethod
     def _build_styles(theme: PdfTheme) -> Dict[str, ParagraphStyle]:
-        styles = getSampleStyleSheet()
-
         base = ParagraphStyle(
             "Base",
-            parent=styles["Normal"],
+            parent=_sample_normal(),
             fontName=theme.body_font,
             fontSize=theme.body_size,
             leading=theme.body_leading,
@@ -72,6 +143,8 @@ class PdfCtx:
             textColor=hex_color(theme.muted_color),
             spaceAfter=theme.space_sm,
         )
+        # Claves de kv(): bold por estilo, sin parsear "<b>...</b>" por fila
+        small_bold = ParagraphStyle("SmallBold", parent=small, fontName=theme.body_font_bold)
 
         h1 = ParagraphStyle(
             "H1",
@@ -106,6 +179,9 @@ class PdfCtx:
             keepWithNext=1,
         )
 
+        # Encabezado de tabla: bold por estilo en vez de envolver cada celda en <b>...</b>
+        table_header = ParagraphStyle("TableHeader", parent=base, fontName=theme.body_font_bold)
+
         note = ParagraphStyle("Note", parent=base, textColor=hex_color(theme.text_color))
         link = ParagraphStyle("Link", parent=base, textColor=hex_color(theme.accent_color))
 
@@ -150,20 +226,23 @@ class PdfCtx:
             "Base": base,
             "Subtitle": subtitle,
             "Small": small,
+            "SmallBold": small_bold,
             "H1": h1,
             "H2": h2,
             "H3": h3,
             "Note": note,
             "Link": link,
             "Code": code,
+            "TableHeader": table_header,
             "TOC0": toc0,
             "TOC1": toc1,
             "TOC2": toc2,
         }
 
     # ---- Flowable factories ----
-    def p(self, html: str, style: Optional[ParagraphStyle] = None) -> Paragraph:
-        return Paragraph(html, style or self.base)
+    def p(self, html: str, style: Optional[ParagraphStyle] = None, _P=Paragraph) -> Paragraph:
+        # `_P` como default: Paragraph queda en un local (es la factory más llamada).
+        return _P(html, style if style is not None else self.base)
 
     def sp(self, h: int = 8) -> Spacer:
         return Spacer(1, h)
@@ -185,6 +264,12 @@ class PdfCtx:
         items.extend(flowables)
         return self.keep(*items)
 
+    def _list_items(self, items: Sequence[Union[str, Paragraph]]) -> List[Any]:
+        # Locales: el comprehension no resuelve atributos por ítem.
+        # isinstance (no `type is`): XPreformatted y otras subclases de Paragraph pasan tal cual.
+        P, pb = Paragraph, self._p_base
+        return [ListItem(it if isinstance(it, P) else pb(it)) for it in items]
+
     def ul(
         self,
         items: Sequence[Union[str, Paragraph]],
@@ -192,7 +277,7 @@ class PdfCtx:
         bullet_indent: int = 8,
         space_after: int = 10,
     ) -> ListFlowable:
-        li: List[Any] = [ListItem(it if isinstance(it, Paragraph) else self.p(it)) for it in items]
+        li = self._list_items(items)
         # Pylance: stubs de reportlab no tipan ListItem como _NestedFlowable (falso positivo).
         return ListFlowable(
             cast(Any, li),
@@ -209,7 +294,7 @@ class PdfCtx:
         bullet_indent: int = 12,
         space_after: int = 10,
     ) -> ListFlowable:
-        li: List[Any] = [ListItem(it if isinstance(it, Paragraph) else self.p(it)) for it in items]
+        li = self._list_items(items)
         # Pylance: stubs de reportlab no tipan ListItem como _NestedFlowable (falso positivo).
         return ListFlowable(
             cast(Any, li),
@@ -236,34 +321,19 @@ class PdfCtx:
         if title:
             rows.append([self.p(title, self.h3)])
 
-        if lines:
-            for ln in lines:
-                rows.append([self.p(ln, self.code)])
-        else:
-            rows.append([self.p("", self.code)])
+        code = self.code
+        rows.extend([[Paragraph(ln, code)] for ln in lines] or [[Paragraph("", code)]])
 
         t = Table(rows, colWidths=["*"], splitByRow=1)
-        t.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, -1), hex_color(self.theme.callout_bg)),
-            ("BOX", (0, 0), (-1, -1), 1, hex_color(self.theme.line_color)),
-            ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ("LEFTPADDING", (0, 0), (-1, -1), 10),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 10),
-
-            # padding chico por fila para no inflar altura
-            ("TOPPADDING", (0, 0), (-1, -1), 0),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
-
-            # aire global arriba/abajo
+        t.setStyle(self._ts["codeblock"])
+        # aire global arriba/abajo (+ separar título del código), en un solo setStyle
+        extra = [
             ("TOPPADDING", (0, 0), (-1, 0), max(8, space_before)),
             ("BOTTOMPADDING", (0, -1), (-1, -1), max(8, space_after)),
-        ]))
-
-        # Si hay título, separar del código
+        ]
         if title and len(rows) >= 2:
-            t.setStyle(TableStyle([
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 6),
-            ]))
+            extra.append(("BOTTOMPADDING", (0, 0), (-1, 0), 6))
+        t.setStyle(extra)
 
         return t
 
@@ -285,42 +355,22 @@ class PdfCtx:
         if not rows:
             rows = [[""]]
 
-        ncols = max(len(r) for r in rows) if rows else 1
+        ncols = max(len(r) for r in rows)
 
-        data: List[List[RLFlowable]] = []
-        for r_i, r in enumerate(rows):
-            rr = list(r) + [""] * max(0, ncols - len(r))
-            out_row: List[RLFlowable] = []
-            for c in rr:
-                if header and r_i == 0:
-                    out_row.append(self.p(f"<b>{c}</b>", self.base))
-                else:
-                    out_row.append(self.p(c, self.base))
-            data.append(out_row)
+        def cells(r: Sequence[str], style: ParagraphStyle) -> List[RLFlowable]:
+            # filas cortas se completan con "" sin armar listas intermedias
+            return [Paragraph(c, style) for c in islice(chain(r, repeat("")), ncols)]
 
-        t = Table(data, colWidths=list(col_widths) if col_widths else ["*"] * ncols, splitByRow=1)
+        data: List[List[RLFlowable]] = [cells(rows[0], self.table_header)] if header else []
+        data.extend(cells(r, self.base) for r in (rows[1:] if header else rows))
 
-        style: List[Tuple[Any, ...]] = [
-            ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ("GRID", (0, 0), (-1, -1), 0.5, hex_color(self.theme.line_color)),
-            ("LEFTPADDING", (0, 0), (-1, -1), 6),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-            ("TOPPADDING", (0, 0), (-1, -1), 3),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
-        ]
+        t = Table(data, colWidths=list(col_widths) if col_widths else ["*"] * ncols, splitByRow=1)
 
+        t.setStyle(self._ts["table"])
         if header and data:
-            style += [
-                ("BACKGROUND", (0, 0), (-1, 0), hex_color(self.theme.callout_bg)),
-                ("LINEBELOW", (0, 0), (-1, 0), 1, hex_color(self.theme.line_color)),
-            ]
-
+            t.setStyle(self._ts["table_header"])
         if aligns:
-            for col, al in enumerate(aligns):
-                if al:
-                    style.append(("ALIGN", (col, 0), (col, -1), al))
-
-        t.setStyle(TableStyle(style))
+            t.setStyle([("ALIGN", (col, 0), (col, -1), al) for col, al in enumerate(aligns) if al])
         t.spaceAfter = space_after
         return t
 
@@ -337,19 +387,7 @@ class PdfCtx:
         - splitByRow=1 para que el recuadro pueda cortarse de forma limpia si es largo.
         """
         kind = (kind or "info").lower().strip()
-
-        if kind == "note":
-            bg = hex_color(self.theme.callout_note_bg)
-            border = hex_color(self.theme.callout_note_border)
-        elif kind == "warn":
-            bg = hex_color(self.theme.callout_warn_bg)
-            border = hex_color(self.theme.callout_warn_border)
-        elif kind == "danger":
-            bg = hex_color(self.theme.callout_danger_bg)
-            border = hex_color(self.theme.callout_danger_border)
-        else:
-            bg = hex_color(self.theme.callout_bg)
-            border = hex_color(self.theme.callout_border)
+        ts = self._ts.get(f"callout_{kind}") or self._ts["callout_info"]
 
         def _as_flowable(x: Union[str, Paragraph, RLFlowable]) -> RLFlowable:
             if isinstance(x, str):
@@ -362,17 +400,18 @@ class PdfCtx:
             return self.p(str(x), self.note)
 
         def _flatten(x: RLFlowable) -> List[RLFlowable]:
-            # Aplanar KeepTogether para permitir split dentro del callout
-            try:
-                from reportlab.platypus.flowables import KeepTogether as RLKeepTogether
-                if isinstance(x, RLKeepTogether):
-                    out: List[RLFlowable] = []
-                    for y in list(getattr(x, "_content", [])):
-                        out.extend(_flatten(_as_flowable(y)))  # type: ignore[arg-type]
-                    return out
-            except Exception:
-                pass
-            return [x]
+            # Aplanar KeepTogether (también anidados) para permitir split dentro del callout.
+            if not isinstance(x, KeepTogether):
+                return [x]
+            out: List[RLFlowable] = []
+            stack: List[RLFlowable] = [x]
+            while stack:
+                y = stack.pop()
+                if isinstance(y, KeepTogether):
+                    stack.extend(reversed([_as_flowable(z) for z in getattr(y, "_content", [])]))  # type: ignore[arg-type]
+                else:
+                    out.append(y)
+            return out
 
         items: List[RLFlowable] = []
         if title:
@@ -389,51 +428,23 @@ class PdfCtx:
 
         rows = [[it] for it in items]
         t = Table(rows, colWidths=["*"], splitByRow=1)
-        t.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, -1), bg),
-            ("BOX", (0, 0), (-1, -1), 1, border),
-            ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ("LEFTPADDING", (0, 0), (-1, -1), 10),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 10),
-
-            # padding mínimo por fila
-            ("TOPPADDING", (0, 0), (-1, -1), 1),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 1),
-
-            # aire global arriba/abajo del recuadro
-            ("TOPPADDING", (0, 0), (-1, 0), 8),
-            ("BOTTOMPADDING", (0, -1), (-1, -1), 8),
-        ]))
+        t.setStyle(ts)
         return t
 
     def kv(self, pairs: Sequence[Tuple[str, str]], space_after: int = 10) -> Flowable:
-        data = []
-        for k, v in pairs:
-            data.append([self.p(f"<b>{k}</b>", self.small), self.p(v, self.small)])
+        kb, small = self.small_bold, self.small
+        data = [[Paragraph(k, kb), Paragraph(v, small)] for k, v in pairs]
 
-        t = Table(data, colWidths=[90, "*"])
-        t.setStyle(TableStyle([
-            ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ("TEXTCOLOR", (0, 0), (-1, -1), hex_color(self.theme.muted_color)),
-            ("LINEBELOW", (0, 0), (-1, -1), 0.5, hex_color(self.theme.line_color)),
-            ("LEFTPADDING", (0, 0), (-1, -1), 0),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 0),
-            ("TOPPADDING", (0, 0), (-1, -1), 3),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
-        ]))
-
-        wrap = Table([[t]], colWidths=["*"])
-        wrap.setStyle(TableStyle([
-            ("BOTTOMPADDING", (0, 0), (-1, -1), space_after),
-            ("LEFTPADDING", (0, 0), (-1, -1), 0),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 0),
-            ("TOPPADDING", (0, 0), (-1, -1), 0),
-        ]))
-        return wrap
+        t = Table(data, colWidths=[90, "*"], spaceAfter=space_after)
+        t.setStyle(self._ts["kv"])
+        return t
 
     # ---- Imágenes (API amigable para tutoriales) ----
     def fig(self, path: Path, caption: str, **kwargs):
         return img_mod.fig(self, path, caption, **kwargs)
 
+    def prewarm_images(self, paths: Sequence[Path]) -> None:
+        img_mod.prewarm_images(paths)
+
     def content_width(self) -> float:
         return img_mod.content_width(self)
@@ -1,8 +1,17 @@
 # Materia/Scripts/_pdf/framework.py
 from __future__ import annotations
 
+import os
+
+from reportlab import rl_config
+
 from .core import PdfTheme, DocSpec
 from .ctx import PdfCtx
 from ..format.render import build_pdf
 
+# Fuera de debug (PDF_DEBUG=1) se apaga la validación de atributos de reportlab.graphics.
+# Tiene que fijarse al importar: reportlab.graphics.shapes lee el flag una sola vez al cargarse.
+if not os.getenv("PDF_DEBUG"):
+    rl_config.shapeChecking = 0
+
 __all__ = ["PdfTheme", "DocSpec", "PdfCtx", "build_pdf"]
@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -15,18 +16,27 @@ def exists(p: Optional[Path]) -> bool:
     return bool(p) and p.is_file()
 
 
+@lru_cache(maxsize=256)
 def hex_color(c: str):
+    # Los themes usan un puñado de colores; el Color resultante se comparte (no mutarlo).
     return colors.HexColor(c)
 
 
+@lru_cache(maxsize=64)
+def _image_reader(path_str: str, mtime_ns: int):
+    # mtime_ns sólo entra en la key: si el archivo cambia, se vuelve a leer.
+    img = ImageReader(path_str)
+    iw, ih = img.getSize()
+    return img, iw, ih
+
+
 def safe_draw_image(c: canv.Canvas, path: Path, x: float, y: float, w: float) -> float:
     """
     Dibuja imagen manteniendo aspect ratio. No revienta si falla.
     Retorna alto dibujado.
     """
     try:
-        img = ImageReader(str(path))
-        iw, ih = img.getSize()
+        img, iw, ih = _image_reader(str(path), path.stat().st_mtime_ns)
         h = w * ih / iw
         c.drawImage(img, x, y - h, width=w, height=h, mask="auto")
         return h
@@ -3,8 +3,9 @@ from __future__ import annotations
 import os
 import shutil
 import sys
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Iterable, Optional, Sequence
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
 
 from .style import (
     RESET, BOLD, DIM,
@@ -69,6 +70,7 @@ class Console:
             pass
 
         self.g = UNICODE_GLYPHS if self.opts.unicode else ASCII_GLYPHS
+        self._buf: Optional[List[str]] = None
 
     def _c(self, s: str, code: str) -> str:
         if not self.opts.color:
@@ -97,7 +99,29 @@ class Console:
         return self._c(s, FG_GRAY)
 
     def print(self, s: str = "") -> None:
-        self.out.write(s + os.linesep)
+        if self._buf is not None:
+            self._buf.append(s + os.linesep)
+        else:
+            self.out.write(s + os.linesep)
+
+    @contextmanager
+    def buffered(self) -> Iterator[None]:
+        """Junta lo impreso dentro del bloque y lo escribe con un solo `write` al salir.
+
+        Pensado para reportes de muchas líneas (tablas, detalle de issues). Es reentrante:
+        un `buffered()` anidado escribe recién cuando cierra el de afuera.
+        """
+        if self._buf is not None:
+            yield
+            return
+        self._buf = []
+        try:
+            yield
+        finally:
+            buf, self._buf = self._buf, None
+            if buf:
+                self.out.write("".join(buf))
+                self.out.flush()
 
     def rule(self, title: str = "") -> None:
         w = max(20, int(self.opts.width or 80))
@@ -1,20 +1,34 @@
 from __future__ import annotations
 
 from dataclasses import asdict
+from functools import wraps
 from pathlib import Path
-from typing import Any, Iterable, Optional, Sequence
+from typing import Any, Callable, Iterable, Optional, Sequence, TypeVar
 
 from .console import Console
 from .fmt import trunc
 
+_F = TypeVar("_F", bound=Callable[..., None])
+
+
+def _buffered(fn: _F) -> _F:
+    """Cada printer sale en un único write (ver Console.buffered)."""
+    @wraps(fn)
+    def wrapper(c: Console, *args: Any, **kwargs: Any) -> None:
+        with c.buffered():
+            fn(c, *args, **kwargs)
+    return wrapper  # type: ignore[return-value]
+
+
+@_buffered
 def print_help(c: Console) -> None:
     c.rule("_pdf — comandos")
     c.print("")
     c.print(c.bold("BUILD (input → output)"))
-    c.print(f"  python -m _pdf.build {c.gray('[--clean] [--check] [--strict] [--search-dir DIR...]')}")
+    c.print(f"  python -m _pdf.build {c.gray('[--clean] [--check] [--strict] [--search-dir DIR...] [--jobs N] [--force]')}")
     c.print("")
     c.print(c.bold("BUILD MATERIA (materia → Resumenes)"))
-    c.print(f"  python -m _pdf.build_materia --materia MATERIA {c.gray('[--area teorico|practico|taller|both|all] [--only 00 01 ...] [--check] [--strict]')}")
+    c.print(f"  python -m _pdf.build_materia --materia MATERIA {c.gray('[--area teorico|practico|taller|both|all] [--only 00 01 ...] [--check] [--strict] [--jobs N] [--force]')}")
     c.print("")
     c.print(c.bold("SCAN / LINT (sin generar PDF)"))
     c.print(f"  python -m _pdf.scan --materia MATERIA {c.gray('[--strict] [--show-skipped]')}")
@@ -45,6 +59,7 @@ def _severity_badge(c: Console, sev: str) -> str:
         return c.yellow(c.g.warn + " WARN")
     return sev
 
+@_buffered
 def print_scan_report(
     c: Console,
     report: Any,
@@ -144,7 +159,8 @@ def print_scan_report(
             c.print(c.gray(f"(se alcanzó --max-skipped={max_skipped}, total skipped={len(skipped_list)})"))
         c.print("")
 
-def print_build_summary(c: Console, *, ok: bool, built: int, out_dir: Path, mode: str = "normal", show_summary: bool = True) -> None:
+@_buffered
+def print_build_summary(c: Console, *, ok: bool, built: int, out_dir: Path, mode: str = "normal", show_summary: bool = True, up_to_date: int = 0) -> None:
     if mode == "quiet" and ok:
         return
     if not show_summary:
@@ -152,4 +168,6 @@ def print_build_summary(c: Console, *, ok: bool, built: int, out_dir: Path, mode
     badge = c.green(c.g.ok + " OK") if ok else c.red(c.g.err + " ERROR")
     c.rule("RESULTADO")
     c.print(f"  {badge}  PDFs generados: {built}")
+    if up_to_date:
+        c.print(f"  {c.gray('al día (sin recompilar)')}: {up_to_date}")
     c.print(f"  {c.gray('output')} {c.g.arrow} {out_dir}")
\ No newline at end of file
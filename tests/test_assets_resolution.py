@@ -12,5 +12,31 @@ class TestAssetsResolution(unittest.TestCase):
             roots = candidate_asset_roots(txt_dir=d, materia=None, extra_dirs=[])
             self.assertIsNotNone(find_asset("x.png", roots))
 
+    def test_find_asset_respects_root_priority(self):
+        with tempfile.TemporaryDirectory() as td:
+            a, b = Path(td) / "a", Path(td) / "b"
+            a.mkdir()
+            b.mkdir()
+            (b / "x.pdf").write_text("b", encoding="utf-8")
+            (a / "x.pdf").write_text("a", encoding="utf-8")
+            (b / "sub").mkdir()
+            (b / "sub" / "y.png").write_text("y", encoding="utf-8")
+            self.assertEqual(find_asset("x.pdf", [a, b]), a / "x.pdf")
+            self.assertEqual(find_asset("sub/y.png", [a, b]), b / "sub" / "y.png")
+            self.assertIsNone(find_asset("nope.pdf", [a, b]))
+
+    def test_find_asset_sees_roots_changed_after_lookup(self):
+        with tempfile.TemporaryDirectory() as td:
+            a, b = Path(td) / "a", Path(td) / "b"
+            a.mkdir()
+            b.mkdir()
+            (b / "x.pdf").write_text("b", encoding="utf-8")
+            self.assertEqual(find_asset("x.pdf", [a, b]), b / "x.pdf")
+            (a / "x.pdf").write_text("a", encoding="utf-8")
+            self.assertEqual(find_asset("x.pdf", [a, b]), a / "x.pdf")
+            (a / "x.pdf").unlink()
+            (b / "x.pdf").unlink()
+            self.assertIsNone(find_asset("x.pdf", [a, b]))
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,6 +2,7 @@ import tempfile
 import unittest
 from pathlib import Path
 
+from _pdf.build_materia import _link_or_copy
 from _pdf.engine.materia import discover_jobs
 
 
@@ -38,6 +39,17 @@ class TestBuildMateriaJobs(unittest.TestCase):
             )
             self.assertEqual(nested_job.out_name, "01Practico.pdf")
 
+    def test_link_or_copy_replaces_stale_mirror(self):
+        with tempfile.TemporaryDirectory() as td:
+            d = Path(td)
+            src, dst = d / "a.pdf", d / "mirror" / "a.pdf"
+            dst.parent.mkdir()
+            src.write_bytes(b"nuevo")
+            dst.write_bytes(b"viejo")
+            _link_or_copy(src, dst)
+            self.assertEqual(dst.read_bytes(), b"nuevo")
+            _link_or_copy(src, dst)  # ya es el mismo archivo: no-op
+            self.assertEqual(sorted(p.name for p in dst.parent.iterdir()), ["a.pdf"])
 
 if __name__ == "__main__":
     unittest.main()
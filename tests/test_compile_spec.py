@@ -0,0 +1,28 @@
+import unittest
+from pathlib import Path
+
+from _pdf.engine.compile import _spec_from_attrs
+
+
+class TestCompileSpec(unittest.TestCase):
+    def test_unknown_keys_and_bad_types_are_ignored(self):
+        attrs = {"foo": "bar", "include_toc": "si", "toc_max_level": 2, "footer_right": 7}
+        spec = _spec_from_attrs(out_path=Path("x.pdf"), attrs=attrs, default_title="x")
+        self.assertEqual(spec.title, "x")
+        self.assertFalse(spec.include_toc)
+        self.assertEqual(spec.toc_max_level, 2)
+        self.assertEqual(spec.footer_right, "7")
+
+    def test_explicit_empty_string_is_kept(self):
+        spec = _spec_from_attrs(out_path=Path("x.pdf"), attrs={"author": "", "footer_center": ""}, default_title="x")
+        self.assertEqual(spec.author, "")
+        self.assertEqual(spec.footer_center, "")
+        self.assertEqual(_spec_from_attrs(out_path=Path("x.pdf"), attrs={}, default_title="x").author, "Lucas Borges")
+
+    def test_header_title_wins_over_default(self):
+        spec = _spec_from_attrs(out_path=Path("x.pdf"), attrs={"title": "Hola"}, default_title="x")
+        self.assertEqual(spec.title, "Hola")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import io
+import unittest
+
+from _pdf.term.console import Console, ConsoleOpts
+
+
+class _CountingOut(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+class TestConsoleBuffered(unittest.TestCase):
+    def test_buffered_block_is_one_write(self):
+        out = _CountingOut()
+        c = Console(out=out, opts=ConsoleOpts(color=False, width=40))
+        with c.buffered():
+            c.print("a")
+            with c.buffered():
+                c.print("b")
+            self.assertEqual(out.writes, 0)
+        self.assertEqual(out.writes, 1)
+        self.assertEqual(out.getvalue().splitlines(), ["a", "b"])
+        c.print("c")
+        self.assertEqual(out.writes, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
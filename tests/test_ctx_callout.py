@@ -0,0 +1,19 @@
+import unittest
+
+from reportlab.platypus import KeepTogether
+
+from _pdf.runtime.core import PdfTheme
+from _pdf.runtime.ctx import PdfCtx
+
+
+class TestCallout(unittest.TestCase):
+    def test_nested_keeptogether_is_flattened_in_order(self):
+        ctx = PdfCtx(PdfTheme())
+        body = ["a", KeepTogether([ctx.p("b"), KeepTogether([ctx.p("c"), "d"]), ctx.p("e")]), "f"]
+        t = ctx.callout("note", "T", body)
+        texts = [row[0].text for row in t._cellvalues]
+        self.assertEqual(texts, ["T", "a", "b", "c", "d", "e", "f"])
+
+
+if __name__ == "__main__":
+    unittest.main()
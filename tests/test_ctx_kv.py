@@ -0,0 +1,22 @@
+import unittest
+
+from reportlab.platypus import Paragraph, Table
+
+from _pdf.runtime.core import PdfTheme
+from _pdf.runtime.ctx import PdfCtx
+
+
+class TestKv(unittest.TestCase):
+    def test_kv_is_a_single_table_with_space_after(self):
+        ctx = PdfCtx(PdfTheme())
+        t = ctx.kv([("Autor", "X"), ("Año", "2026")], space_after=14)
+        self.assertIsInstance(t, Table)
+        self.assertEqual(t.spaceAfter, 14)
+        self.assertEqual(len(t._cellvalues), 2)
+        for key, _val in t._cellvalues:
+            self.assertIsInstance(key, Paragraph)
+            self.assertIs(key.style, ctx.small_bold)
+
+
+if __name__ == "__main__":
+    unittest.main()
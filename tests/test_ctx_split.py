@@ -0,0 +1,49 @@
+import io
+import unittest
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import PageBreak, SimpleDocTemplate
+
+from _pdf.runtime.core import PdfTheme
+from _pdf.runtime.ctx import PdfCtx
+
+try:
+    import fitz  # type: ignore
+except Exception:  # PyMuPDF es opcional
+    fitz = None
+
+
+@unittest.skipIf(fitz is None, "PyMuPDF no instalado")
+class TestLongTablesSplit(unittest.TestCase):
+    def _render(self, flowable) -> "fitz.Document":
+        buf = io.BytesIO()
+        SimpleDocTemplate(buf, pagesize=A4).build([flowable])
+        return fitz.open("pdf", buf.getvalue())
+
+    def test_long_codeblock_and_table_split_across_pages_without_losing_rows(self):
+        ctx = PdfCtx(PdfTheme())
+        n = 300
+        for flowable in (
+            ctx.codeblock([f"linea{i}" for i in range(n)], title="Código"),
+            ctx.table([["A", "B"]] + [[f"fila{i}", "x"] for i in range(n)]),
+        ):
+            doc = self._render(flowable)
+            self.assertGreater(doc.page_count, 1)
+            words = [w[4] for page in doc for w in page.get_text("words")]
+            rows = [w for w in words if w.startswith(("linea", "fila"))]
+            self.assertEqual(len(rows), n)
+
+
+class TestSpacers(unittest.TestCase):
+    def test_sp_returns_a_fresh_spacer_each_time(self):
+        # doctemplate marca `_postponed` en el flowable que no entra: no se pueden compartir
+        ctx = PdfCtx(PdfTheme())
+        doc = SimpleDocTemplate(io.BytesIO(), pagesize=A4)
+        filler = doc.height - 12 - 5  # frame (sin paddings) menos 5 pt: el spacer no entra al pie
+        self.assertIsNot(ctx.sp(10), ctx.sp(10))
+        story = [ctx.sp(filler), ctx.sp(10), PageBreak(), ctx.sp(filler), ctx.sp(10)]
+        doc.build(story)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
+import tempfile
 import unittest
-from _pdf.engine.docheader import parse_doc_header
+from pathlib import Path
+
+from _pdf.engine.docheader import _parse_scalar, load_doc, parse_doc_header
 
 class TestDocHeader(unittest.TestCase):
     def test_parse_simple(self):
@@ -19,10 +22,49 @@ class TestDocHeader(unittest.TestCase):
         self.assertIn("foo", unknown)
         self.assertEqual(attrs["foo"], "bar")
 
+    def test_quoted_values(self):
+        text = '[DOC title="Hola mundo" subtitle=\'a "b"\' footer_right="x\\"y"]\n'
+        attrs, unknown, rest, err = parse_doc_header(text)
+        self.assertIsNone(err)
+        self.assertEqual(attrs["title"], "Hola mundo")
+        self.assertEqual(attrs["subtitle"], 'a "b"')
+        self.assertEqual(attrs["footer_right"], 'x"y')
+
+    def test_parse_scalar_ints(self):
+        self.assertEqual(_parse_scalar("-12"), -12)
+        self.assertEqual(_parse_scalar(" 3 "), 3)
+        for v in ("--1", "-", "+3", "1.5", "²"):
+            self.assertEqual(_parse_scalar(v), v)
+
+    def test_header_detection(self):
+        attrs, _, rest, err = parse_doc_header('\n  [DOC]  \nBody')
+        self.assertEqual((attrs, err), ({}, None))
+        self.assertEqual(rest, "\nBody")
+        attrs, _, rest, _ = parse_doc_header('[DOC title="x"] tail\nBody')
+        self.assertEqual(attrs, {})
+        self.assertIn("tail", rest)
+
+    def test_rest_keeps_line_endings(self):
+        attrs, _, rest, err = parse_doc_header('[DOC title="x"]\r\nA\r\nB\r\n')
+        self.assertIsNone(err)
+        self.assertEqual(attrs["title"], "x")
+        self.assertEqual(rest, "A\r\nB\r\n")
+
     def test_bad_shlex(self):
         text = '[DOC title="unterminated]\n'
         attrs, unknown, rest, err = parse_doc_header(text)
         self.assertIsNotNone(err)
 
+    def test_load_doc_cached_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "a.txt"
+            p.write_text('[DOC title="A"]\nBody\n', encoding="utf-8")
+            first = load_doc(p)
+            self.assertIs(load_doc(p), first)
+            self.assertEqual(first.attrs["title"], "A")
+
+            p.write_text('[DOC title="Otro"]\nBody\n', encoding="utf-8")
+            self.assertEqual(load_doc(p).attrs["title"], "Otro")
+
 if __name__ == "__main__":
     unittest.main()
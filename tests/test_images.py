@@ -0,0 +1,71 @@
+import io
+import unittest
+from pathlib import Path
+import tempfile
+
+from reportlab.pdfgen import canvas
+
+from _pdf.format.images import _image_dims, asset, prewarm_images
+from _pdf.runtime.utils import _image_reader, safe_draw_image
+
+try:
+    from PIL import Image as PILImage
+except Exception:  # Pillow es opcional
+    PILImage = None
+
+
+class TestPrewarmImages(unittest.TestCase):
+    @unittest.skipIf(PILImage is None, "Pillow no instalado")
+    def test_prewarm_fills_dims_cache_and_skips_missing(self):
+        with tempfile.TemporaryDirectory() as td:
+            d = Path(td)
+            paths = []
+            for i, size in enumerate(((10, 20), (30, 5), (7, 7))):
+                p = d / f"i{i}.png"
+                PILImage.new("RGB", size).save(p)
+                paths.append(p)
+
+            _image_dims.cache_clear()
+            prewarm_images(paths + [d / "nope.png", paths[0]])
+            self.assertEqual(_image_dims.cache_info().currsize, 3)
+
+            st = paths[1].stat()
+            self.assertEqual(_image_dims(str(paths[1]), st.st_mtime_ns, st.st_size), (30.0, 5.0))
+            self.assertEqual(_image_dims.cache_info().hits, 1)
+
+
+class TestSafeDrawImage(unittest.TestCase):
+    @unittest.skipIf(PILImage is None, "Pillow no instalado")
+    def test_header_image_is_read_once_across_documents(self):
+        with tempfile.TemporaryDirectory() as td:
+            logo = Path(td) / "logo.png"
+            PILImage.new("RGB", (40, 10)).save(logo)
+
+            _image_reader.cache_clear()
+            for _ in range(3):
+                c = canvas.Canvas(io.BytesIO())
+                self.assertEqual(safe_draw_image(c, logo, 0, 100, w=200), 50.0)
+                c.save()
+            info = _image_reader.cache_info()
+            self.assertEqual((info.misses, info.hits), (1, 2))
+            self.assertEqual(safe_draw_image(canvas.Canvas(io.BytesIO()), Path(td) / "nope.png", 0, 0, w=10), 0.0)
+            _image_reader.cache_clear()
+
+
+class TestAsset(unittest.TestCase):
+    def test_base_then_fallback_and_late_assets_are_found(self):
+        with tempfile.TemporaryDirectory() as td:
+            base, fb = Path(td) / "base", Path(td) / "fb"
+            base.mkdir()
+            fb.mkdir()
+            (fb / "a.png").write_bytes(b"x")
+            self.assertEqual(asset(base, "a.png", fallback_dir=fb), fb / "a.png")
+
+            # un miss no se cachea: si el asset aparece después, se encuentra
+            self.assertEqual(asset(base, "late.png", fallback_dir=fb), base / "late.png")
+            (fb / "late.png").write_bytes(b"x")
+            self.assertEqual(asset(base, "late.png", fallback_dir=fb), fb / "late.png")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from _pdf import build_carpeta
+from _pdf.engine.compile import _asset_deps, _is_up_to_date, compile_txt
+
+
+class TestIncrementalBuild(unittest.TestCase):
+    def test_asset_deps_from_markers(self):
+        rest = '[FIG file="a.pdf" page=1]\nTexto\n  [IMG file="b.png"]\n[FIG roto]\n'
+        deps = _asset_deps(rest, lambda n: Path("pdf") / n, lambda n: Path("img") / n)
+        self.assertEqual(deps, [Path("pdf") / "a.pdf", Path("img") / "b.png"])
+
+    def test_up_to_date_by_mtime(self):
+        with tempfile.TemporaryDirectory() as td:
+            d = Path(td)
+            dep, out = d / "a.txt", d / "a.pdf"
+            dep.write_text("x", encoding="utf-8")
+            self.assertFalse(_is_up_to_date(out, [dep]))
+            out.write_bytes(b"%PDF")
+            os.utime(dep, ns=(1_000_000_000, 1_000_000_000))
+            self.assertTrue(_is_up_to_date(out, [dep]))
+            self.assertFalse(_is_up_to_date(out, [dep, d / "falta.png"]))
+
+    def test_compile_skips_when_not_forced(self):
+        with tempfile.TemporaryDirectory() as td:
+            d = Path(td)
+            txt = d / "doc.txt"
+            txt.write_text('[DOC title="X"]\nHola\n', encoding="utf-8")
+            out, skipped = compile_txt(txt, out_dir=d, force=False)
+            self.assertFalse(skipped)
+            os.utime(txt, ns=(1_000_000_000, 1_000_000_000))
+            before = out.stat().st_mtime_ns
+            self.assertEqual(compile_txt(txt, out_dir=d, force=False), (out, True))
+            self.assertEqual(out.stat().st_mtime_ns, before)
+
+            os.utime(txt)  # ahora el .txt es más nuevo
+            os.utime(out, ns=(1_000_000_000, 1_000_000_000))
+            self.assertEqual(compile_txt(txt, out_dir=d, force=False), (out, False))
+            self.assertGreater(out.stat().st_mtime_ns, 1_000_000_000)
+
+    def test_noop_rebuild_reports_nothing_generated(self):
+        with tempfile.TemporaryDirectory() as td:
+            d = Path(td)
+            (d / "a").mkdir()
+            (d / "a" / "a.txt").write_text('[DOC title="A"]\nHola\n', encoding="utf-8")
+            logs = []
+            for _ in range(2):
+                buf = io.StringIO()
+                with redirect_stdout(buf), self.assertRaises(SystemExit) as cm:
+                    build_carpeta.main(["--carpeta", str(d / "a"), "-j", "1", "--no-color", "--ascii"])
+                self.assertEqual(cm.exception.code, 0)
+                logs.append(buf.getvalue())
+            self.assertIn("PDFs generados: 1", logs[0])
+            self.assertNotIn("al día", logs[0])
+            self.assertIn("PDFs generados: 0", logs[1])
+            self.assertIn("al día (sin recompilar): 1", logs[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 
-from _pdf.format.txtfmt import sanitize_para
+from _pdf.format.txtfmt import sanitize_code_line, sanitize_para
+from _pdf.format.txtfmt_inline import _reset_caches
 
 
 class TestInlineCodeProtection(unittest.TestCase):
@@ -34,6 +35,29 @@ class TestInlineCodeProtection(unittest.TestCase):
             '<font face="Courier">[a](https://example.com)</font>',
         )
 
+    def test_line_without_markup_is_only_escaped(self):
+        self.assertEqual(sanitize_para("a < b & c  d"), "a &lt; b &amp; c d")
+        self.assertEqual(sanitize_para("`x` sin asteriscos"), '<font face="Courier">x</font> sin asteriscos')
+
+    def test_code_line_ascii_and_unicode(self):
+        self.assertEqual(sanitize_code_line("\tif a<b: x = 1"), "&nbsp;&nbsp;&nbsp;&nbsp;if&nbsp;a&lt;b:&nbsp;x&nbsp;=&nbsp;1")
+        self.assertEqual(sanitize_code_line("a → b"), "a&nbsp;-&gt;&nbsp;b")
+
+    def test_unicode_normalization_in_one_pass(self):
+        # el VS16 se quita antes de reconocer la frase "🟢 OK"; el resto del rango emoji se borra
+        self.assertEqual(
+            sanitize_para("🟢\ufe0f OK ✓ → ⊕ ▷◁ 💡 😀 fin"),
+            "OK OK -&gt; XOR JOIN TIP fin",
+        )
+
+    def test_repeated_lines_hit_the_cache(self):
+        _reset_caches()
+        first = sanitize_para("**Nota**  repetida")
+        self.assertEqual(sanitize_para("**Nota**  repetida"), first)
+        self.assertEqual(sanitize_para.cache_info().hits, 1)
+        _reset_caches()
+        self.assertEqual(sanitize_para.cache_info().currsize, 0)
+
 
 if __name__ == "__main__":
     unittest.main()
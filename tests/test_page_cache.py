@@ -0,0 +1,178 @@
+import unittest
+from pathlib import Path
+from unittest import mock
+import tempfile
+
+from _pdf.engine.paths import page_cache_dir
+from _pdf.runtime.core import PdfTheme
+from _pdf.runtime.ctx import PdfCtx
+from _pdf.format.images import close_open_pdfs, fig_pdf_page, _page_cache_key, page_png_path, pdf_page_to_png, pdf_pages_to_pngs, prerender_pages, raster_zoom, shutdown_prerender_pools
+
+try:
+    import fitz  # type: ignore
+except Exception:  # PyMuPDF es opcional
+    fitz = None
+
+
+class TestPageCache(unittest.TestCase):
+    def test_same_stem_different_pdf_gets_distinct_key(self):
+        with tempfile.TemporaryDirectory() as td:
+            a = Path(td) / "a" / "slides.pdf"
+            b = Path(td) / "b" / "slides.pdf"
+            a.parent.mkdir()
+            b.parent.mkdir()
+            a.write_bytes(b"%PDF-1.4 a")
+            b.write_bytes(b"%PDF-1.4 b")
+            ka, kb = _page_cache_key(a), _page_cache_key(b)
+            self.assertTrue(ka.startswith("slides-"))
+            self.assertNotEqual(ka, kb)
+            self.assertEqual(ka, _page_cache_key(a))
+
+    def test_cache_dir_prefers_materia_scripts(self):
+        with tempfile.TemporaryDirectory() as td:
+            m = Path(td)
+            self.assertNotEqual(page_cache_dir(m).parent, m / "Scripts" / "_pdf")
+            (m / "Scripts" / "_pdf").mkdir(parents=True)
+            self.assertEqual(page_cache_dir(m), m / "Scripts" / "_pdf" / ".pagecache")
+
+    @unittest.skipIf(fitz is None, "PyMuPDF no instalado")
+    def test_prerender_pages_fills_cache(self):
+        with tempfile.TemporaryDirectory() as td:
+            d = Path(td)
+            src = d / "s.pdf"
+            doc = fitz.open()
+            for _ in range(2):
+                doc.new_page(width=100, height=100)
+            doc.save(str(src))
+            doc.close()
+
+            items = [(src, p, page_png_path(src, p, zoom=1.0, cache_dir=d / "c"), 1.0) for p in (1, 2, 1)]
+            prerender_pages(items, max_workers=2)
+            for _, _, png, _ in items:
+                self.assertTrue(png.is_file())
+
+            more = [(src, p, page_png_path(src, p, zoom=0.5, cache_dir=d / "c"), 0.5) for p in (1, 2)]
+            prerender_pages(more, max_workers=2)
+            self.assertTrue(all(png.is_file() for _, _, png, _ in more))
+            shutdown_prerender_pools()
+
+    def test_prerender_pool_honours_max_workers_and_is_reused(self):
+        import concurrent.futures
+
+        created = []
+
+        class FakePool:
+            def __init__(self, max_workers, mp_context):
+                created.append((max_workers, mp_context.get_start_method()))
+
+            def map(self, fn, items):
+                return [fn(it) for it in items]
+
+            def shutdown(self):
+                pass
+
+        with tempfile.TemporaryDirectory() as td:
+            d = Path(td)
+            items = [(d / "nope.pdf", p, d / f"p{p}.png", 1.0) for p in (1, 2, 3)]
+            with mock.patch.object(concurrent.futures, "ProcessPoolExecutor", FakePool), \
+                    mock.patch("_pdf.format.images.pdf_page_to_png", return_value=False):
+                prerender_pages(items, max_workers=2)
+                prerender_pages(items[:2], max_workers=2)  # mismo tope: mismo pool
+                prerender_pages(items, max_workers=3)
+                self.assertEqual(created, [(2, "spawn"), (3, "spawn")])
+                shutdown_prerender_pools()
+                prerender_pages(items, max_workers=2)  # tras cerrar se crea uno nuevo
+                self.assertEqual(len(created), 3)
+                shutdown_prerender_pools()
+
+    @unittest.skipIf(fitz is None, "PyMuPDF no instalado")
+    def test_photographic_page_is_exported_as_jpeg(self):
+        with tempfile.TemporaryDirectory() as td:
+            d = Path(td)
+            src = d / "scan.pdf"
+            doc = fitz.open()
+            photo = doc.new_page(width=100, height=100)
+            pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 50, 50), False)
+            pix.set_rect(pix.irect, (200, 30, 30))
+            photo.insert_image(photo.rect, pixmap=pix)
+            doc.new_page(width=100, height=100).insert_text((10, 50), "texto")
+            doc.save(str(src))
+            doc.close()
+
+            jpg = page_png_path(src, 1, zoom=1.0, cache_dir=d)
+            png = page_png_path(src, 2, zoom=1.0, cache_dir=d)
+            self.assertTrue(pdf_page_to_png(src, 1, jpg, zoom=1.0))
+            self.assertTrue(pdf_page_to_png(src, 2, png, zoom=1.0))
+            self.assertTrue(jpg.with_suffix(".jpg").is_file())
+            self.assertFalse(jpg.is_file())
+            self.assertTrue(png.is_file())
+
+    @unittest.skipIf(fitz is None, "PyMuPDF no instalado")
+    def test_raster_zoom_caps_at_two_px_per_target_pt(self):
+        with tempfile.TemporaryDirectory() as td:
+            src = Path(td) / "wide.pdf"
+            doc = fitz.open()
+            doc.new_page(width=800, height=450)
+            doc.save(str(src))
+            doc.close()
+
+            self.assertEqual(raster_zoom(src, 1, zoom=2.0, target_w=400), 1.0)
+            self.assertEqual(raster_zoom(src, 1, zoom=2.0, target_w=1000), 2.0)
+            self.assertEqual(raster_zoom(Path(td) / "nope.pdf", 1, zoom=3.0, target_w=400), 3.0)
+
+    @unittest.skipIf(fitz is None, "PyMuPDF no instalado")
+    def test_batch_export_opens_the_pdf_once(self):
+        with tempfile.TemporaryDirectory() as td:
+            d = Path(td)
+            src = d / "s.pdf"
+            doc = fitz.open()
+            for _ in range(3):
+                doc.new_page(width=100, height=100)
+            doc.save(str(src))
+            doc.close()
+
+            opened = []
+            real_open = fitz.open
+
+            def spy_open(*a, **kw):
+                opened.append(real_open(*a, **kw))
+                return opened[-1]
+
+            close_open_pdfs()
+            with mock.patch.object(fitz, "open", spy_open):
+                outs = pdf_pages_to_pngs(src, [(p, page_png_path(src, p, zoom=1.0, cache_dir=d), 1.0) for p in (1, 2, 3)])
+                self.assertTrue(all(o is not None and o.is_file() for o in outs))
+                self.assertEqual(len(opened), 1)
+
+                # si el PDF cambia se reabre y el Document viejo se cierra (no queda bloqueado)
+                doc = real_open()
+                doc.new_page(width=200, height=200)
+                doc.save(str(src))
+                doc.close()
+                self.assertIsNotNone(pdf_pages_to_pngs(src, [(1, d / "new.png", 1.0)])[0])
+                self.assertEqual(len(opened), 2)
+                self.assertTrue(opened[0].is_closed)
+
+            close_open_pdfs()
+            self.assertTrue(opened[1].is_closed)
+
+    @unittest.skipIf(fitz is None, "PyMuPDF no instalado")
+    def test_repeated_fig_resolves_page_once_but_builds_new_flowables(self):
+        with tempfile.TemporaryDirectory() as td:
+            d = Path(td)
+            src = d / "s.pdf"
+            doc = fitz.open()
+            doc.new_page(width=100, height=100)
+            doc.save(str(src))
+            doc.close()
+
+            ctx = PdfCtx(PdfTheme())
+            a = fig_pdf_page(ctx, src, 1, cache_dir=d / "c")
+            b = fig_pdf_page(ctx, src, 1, cache_dir=d / "c")
+            self.assertTrue(a and b)
+            self.assertEqual(len(ctx._fig_pages), 1)
+            self.assertIsNot(a[0], b[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from _pdf import build_carpeta
+from _pdf.engine.parallel import effective_jobs, run_jobs
+
+
+def _half(n):
+    if n % 2:
+        raise ValueError(f"impar: {n}")
+    return n // 2
+
+
+class TestParallelJobs(unittest.TestCase):
+    def test_sequential_keeps_order_and_captures_errors(self):
+        jobs = [dict(n=n) for n in (4, 3, 8)]
+        out = list(run_jobs(_half, jobs, max_workers=1))
+        self.assertEqual([idx for idx, _, _ in out], [0, 1, 2])
+        self.assertEqual(out[0][1], 2)
+        self.assertIsInstance(out[1][2], ValueError)
+        self.assertEqual(out[2][1], 4)
+
+    def test_pool_keeps_order(self):
+        jobs = [dict(n=n) for n in (2, 4, 6, 8)]
+        out = list(run_jobs(_half, jobs, max_workers=2))
+        self.assertEqual([res for _, res, _ in out], [1, 2, 3, 4])
+        self.assertTrue(all(err is None for _, _, err in out))
+
+    def test_effective_jobs_never_exceeds_job_count(self):
+        with mock.patch("_pdf.engine.parallel.default_jobs", return_value=8):
+            self.assertEqual(effective_jobs(None, 1), 1)
+            self.assertEqual(effective_jobs(None, 20), 8)
+        self.assertEqual(effective_jobs(8, 3), 3)
+        self.assertEqual(effective_jobs(2, 5), 2)
+
+    def test_single_document_build_enables_prefetch(self):
+        with tempfile.TemporaryDirectory() as td:
+            txt = Path(td) / "a" / "a.txt"
+            txt.parent.mkdir()
+            txt.write_text('[DOC title="A"]\nHola\n', encoding="utf-8")
+            calls = []
+
+            def fake_compile(**kwargs):
+                calls.append(kwargs)
+                return kwargs["out_dir"] / kwargs["out_name"], False
+
+            # máquina con varios núcleos: el default pediría 8 workers para un solo documento
+            with mock.patch("_pdf.engine.parallel.default_jobs", return_value=8), \
+                    mock.patch("_pdf.engine.compile.compile_txt", fake_compile):
+                with self.assertRaises(SystemExit) as cm:
+                    build_carpeta.main(["--carpeta", td, "--quiet"])
+            self.assertEqual(cm.exception.code, 0)
+            self.assertEqual(len(calls), 1)
+            self.assertTrue(calls[0]["prefetch"])
+
+
+if __name__ == "__main__":
+    unittest.main()
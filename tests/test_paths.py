@@ -0,0 +1,41 @@
+import os
+import unittest
+from pathlib import Path
+import tempfile
+from unittest import mock
+
+from _pdf.engine.paths import _looks_like_materia_root, find_materia_root
+
+
+class TestFindMateriaRoot(unittest.TestCase):
+    def test_found_from_nested_dir_and_memoized(self):
+        with tempfile.TemporaryDirectory() as td:
+            m = Path(td).resolve()
+            nested = m / "Practico" / "01"
+            nested.mkdir(parents=True)
+            with mock.patch.dict(os.environ, {"PDF_MATERIA_ROOT": ""}):
+                first = find_materia_root(nested)
+                self.assertEqual(first, m)
+                self.assertIs(find_materia_root(nested), first)
+
+    def test_env_is_part_of_the_key(self):
+        with tempfile.TemporaryDirectory() as a, tempfile.TemporaryDirectory() as b:
+            ma, mb = Path(a).resolve(), Path(b).resolve()
+            (ma / "Teorico").mkdir()
+            (mb / "Taller").mkdir()
+            with mock.patch.dict(os.environ, {"PDF_MATERIA_ROOT": ""}):
+                self.assertEqual(find_materia_root(ma), ma)
+            with mock.patch.dict(os.environ, {"PDF_MATERIA_ROOT": str(mb)}):
+                self.assertEqual(find_materia_root(ma), mb)
+
+    def test_marker_must_be_a_directory(self):
+        with tempfile.TemporaryDirectory() as td:
+            m = Path(td).resolve()
+            (m / "Practico").write_text("no soy carpeta", encoding="utf-8")
+            self.assertFalse(_looks_like_materia_root(m))
+            (m / "Teorico").mkdir()
+            self.assertTrue(_looks_like_materia_root(m))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import io
+import unittest
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Frame, PageTemplate, Paragraph
+from reportlab.platypus.tableofcontents import TableOfContents
+
+from _pdf.format.render import FbdDocTemplate
+
+
+class TestAutoBookmarkKeys(unittest.TestCase):
+    def test_unlabeled_headings_get_distinct_stable_keys(self):
+        doc = FbdDocTemplate(io.BytesIO(), pagesize=A4, toc=TableOfContents())
+        doc.addPageTemplates([PageTemplate(id="p", frames=[Frame(0, 0, *A4)])])
+        entries = []
+        doc.notify = lambda kind, stuff: entries.append(stuff)
+        h1 = ParagraphStyle("H1")
+        story = [Paragraph("Repetido", h1), Paragraph("Repetido", h1)]
+        doc.build(list(story))
+        first = [e[3] for e in entries]
+        self.assertEqual(len(set(first)), 2)
+
+        entries.clear()
+        doc.build(list(story))
+        self.assertEqual([e[3] for e in entries], first)
+
+    def test_skipped_and_body_paragraphs_do_not_reach_toc(self):
+        doc = FbdDocTemplate(io.BytesIO(), pagesize=A4, toc=TableOfContents())
+        doc.addPageTemplates([PageTemplate(id="p", frames=[Frame(0, 0, *A4)])])
+        entries = []
+        doc.notify = lambda kind, stuff: entries.append(stuff)
+        title = Paragraph("Título", ParagraphStyle("H1"))
+        for attr in ("_fbd_skip_toc", "_fbd_skip_outline"):
+            setattr(title, attr, True)
+        title._fbd_key = "toc"
+        doc.build([title, Paragraph("cuerpo", ParagraphStyle("Base")), Paragraph("Sección", ParagraphStyle("H2"))])
+        self.assertEqual([(e[0], e[1]) for e in entries], [(1, "Sección")])
+
+
+class TestBufferedOutput(unittest.TestCase):
+    def test_multibuild_into_buffer_keeps_only_last_pass(self):
+        buf = io.BytesIO()
+        doc = FbdDocTemplate(buf, pagesize=A4, toc=TableOfContents())
+        doc.addPageTemplates([PageTemplate(id="p", frames=[Frame(0, 0, *A4)])])
+        doc.multiBuild([doc._toc, Paragraph("Sección", ParagraphStyle("H1"))])
+        data = buf.getvalue()
+        self.assertTrue(data.startswith(b"%PDF"))
+        self.assertEqual(data.count(b"%%EOF"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,7 @@ import unittest
 from pathlib import Path
 import tempfile
 
-from _pdf.engine.scanlib import discover_txts
+from _pdf.engine.scanlib import discover_txts, walk_txts
 
 class TestScanCandidates(unittest.TestCase):
     def test_discover_txts_filters(self):
@@ -20,5 +20,15 @@ class TestScanCandidates(unittest.TestCase):
             self.assertTrue(any(p.name == good.name for p in found))
             self.assertTrue(any(p.name == junk.name for p in skipped) or True)
 
+    def test_walk_txts_prunes_skipped_dirs(self):
+        with tempfile.TemporaryDirectory() as td:
+            base = Path(td)
+            (base / "a" / "output").mkdir(parents=True)
+            (base / "a" / "x.txt").write_text("x", encoding="utf-8")
+            (base / "a" / "output" / "y.txt").write_text("y", encoding="utf-8")
+            (base / "a" / "z.md").write_text("z", encoding="utf-8")
+            found = sorted(walk_txts(base, skip_dir=lambda n: n == "output"))
+            self.assertEqual(found, [base / "a" / "x.txt"])
+
 if __name__ == "__main__":
     unittest.main()
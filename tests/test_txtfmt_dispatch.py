@@ -0,0 +1,72 @@
+import unittest
+from pathlib import Path
+
+from reportlab.platypus import Paragraph
+
+from _pdf.format.txtfmt_structure import parse_pipe_table, slugify, unique_key
+from _pdf.format.txtfmt import _is_plain_text, _paragraph_should_stop, txt_to_flowables
+from _pdf.runtime.core import PdfTheme
+from _pdf.runtime.ctx import PdfCtx
+
+
+class TestLineDispatch(unittest.TestCase):
+    def test_plain_text_prefilter(self):
+        for raw in ("Texto normal", "(a) nota", "¿Por qué?", "Ámbito"):
+            self.assertTrue(_is_plain_text(raw, raw.strip()), raw)
+        for raw in ("[PB]", ":::def X", "０. Título", "٣) ítem", "=====", "- item", "* item", "• item", "```", "1. Paso", "    code", "\tx"):
+            self.assertFalse(_is_plain_text(raw, raw.strip()), raw)
+
+    def test_paragraph_continuation_stops_only_on_structure(self):
+        self.assertFalse(_paragraph_should_stop("sigue el párrafo"))
+        self.assertTrue(_paragraph_should_stop("- item"))
+        self.assertTrue(_paragraph_should_stop("[PB]"))
+        self.assertTrue(_paragraph_should_stop("    indentado"))
+        self.assertTrue(_paragraph_should_stop("2.1. Título"))
+        self.assertTrue(_paragraph_should_stop("０. Título"))
+        self.assertTrue(_paragraph_should_stop("-----"))
+        self.assertFalse(_paragraph_should_stop("3 manzanas"))
+        self.assertFalse(_paragraph_should_stop("-x sin espacio"))
+        self.assertFalse(_paragraph_should_stop("[no es marcador]"))
+
+    def test_plain_lines_join_into_one_paragraph(self):
+        ctx = PdfCtx(PdfTheme())
+        story = txt_to_flowables(ctx, "uno\ndos\n- item", resolve_pdf=lambda n: Path(n))
+        paras = [f for f in story if isinstance(f, Paragraph)]
+        self.assertIn("uno", paras[0].text)
+        self.assertIn("dos", paras[0].text)
+
+    def test_nested_blocks_reuse_body_lines(self):
+        ctx = PdfCtx(PdfTheme())
+        seen = []
+        orig = ctx.callout
+
+        def spy(kind, title, body):
+            seen.append((kind, title))
+            return orig(kind, title, body)
+
+        ctx.callout = spy
+        text = "[NOTE title=\"N\"]\nantes\n:::def D\ncuerpo\n:::\n[/NOTE]"
+        txt_to_flowables(ctx, text, resolve_pdf=lambda n: Path(n))
+        self.assertEqual(seen, [("note", "D"), ("note", "N")])
+
+
+class TestHeadingKeys(unittest.TestCase):
+    def test_slug_and_repeated_keys(self):
+        self.assertEqual(slugify("2.1. Árbol -- binario!"), "2-1-árbol-binario")
+        self.assertEqual(slugify("!!!"), "sec")
+        used = {}
+        self.assertEqual([unique_key("Intro", used) for _ in range(3)], ["intro", "intro-2", "intro-3"])
+        self.assertEqual(unique_key("Intro 2", used), "intro-2-2")
+        self.assertEqual(unique_key("Intro", used), "intro-4")
+
+
+class TestPipeTable(unittest.TestCase):
+    def test_rows_aligns_and_ragged_rows(self):
+        rows, aligns = parse_pipe_table(["| A | B | C |", "|:---|:---:|---:|", "no es fila", "", "| 1 | **2** |"])
+        self.assertEqual(rows, [["A", "B", "C"], ["1", "<b>2</b>"]])
+        self.assertEqual(aligns, ["LEFT", "CENTER", "RIGHT"])
+        self.assertEqual(parse_pipe_table(["sin pipes"]), ([[""]], None))
+
+
+if __name__ == "__main__":
+    unittest.main()